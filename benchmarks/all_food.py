@@ -0,0 +1,61 @@
+import time
+from pathlib import Path
+
+from .common import new_state
+from src.pacman.search.heuristics import all_food_heuristic, mst_food_heuristic
+from src.pacman.search.problems import AllFoodProblem
+from src.pacman.search.solvers import a_star
+from src.utils.layout import Layout
+from src.utils.timer import Timer
+
+LAYOUT_DIR = Path("assets/layouts")
+# Exact all-food search is hopeless on the larger layouts, so give up early
+MAX_SECONDS = 20.0
+HEURISTICS = {
+    "nearest food": all_food_heuristic,
+    "nearest + mst": mst_food_heuristic,
+}
+
+
+class SearchAborted(Exception):
+    pass
+
+
+def limit_search(problem: AllFoodProblem) -> list[int]:
+    counter = [0]
+    get_neighbors = problem.get_neighbors
+    deadline = time.perf_counter() + MAX_SECONDS
+
+    def counted(parent):
+        counter[0] += 1
+        if time.perf_counter() > deadline:
+            raise SearchAborted()
+        return get_neighbors(parent)
+
+    problem.get_neighbors = counted
+    return counter
+
+
+def main() -> None:
+    for path in sorted(LAYOUT_DIR.glob("*.lay")):
+        state = new_state(Layout.from_text(path.stem), 0)
+        for label, heuristic in HEURISTICS.items():
+            problem = AllFoodProblem(state)
+            counter = limit_search(problem)
+            timer = Timer()
+            timer.start()
+            try:
+                moves = len(a_star(problem, heuristic=heuristic))
+            except SearchAborted:
+                moves = None
+            timer.stop()
+            result = f"{moves:>4} moves" if moves is not None else "gave up   "
+            print(
+                f"{path.stem:<8} {len(problem.get_food()):>3} food",
+                f"{label:<14} {result} {counter[0]:>6} expansions",
+                f"{timer.elapsed:>8.3f}s",
+            )
+
+
+if __name__ == "__main__":
+    main()
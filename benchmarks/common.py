@@ -0,0 +1,34 @@
+import random
+import numpy as np
+from typing import Callable
+
+from src.pacman.rules import GameState
+from src.utils.layout import Layout
+from src.utils.timer import Timer
+
+
+def seed_all(seed: int = 0) -> None:
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def new_state(layout: Layout, num_ghosts: int = 4) -> GameState:
+    state = GameState()
+    state.initialize(layout, num_ghosts)
+    return state
+
+
+def measure(fn: Callable[[], int], repeat: int = 3) -> tuple[int, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        timer = Timer()
+        timer.start()
+        count = fn()
+        timer.stop()
+        best = min(best, timer.elapsed)
+    return count, best
+
+
+def report(name: str, count: int, elapsed: float, unit: str = "ops") -> None:
+    rate = count / elapsed
+    print(f"{name:<36} {count:>9} {unit} {elapsed:>8.4f}s {rate:>12.1f}/s")
@@ -0,0 +1,105 @@
+import contextlib
+import io
+import tempfile
+from functools import partial
+from pathlib import Path
+
+from .common import report, seed_all
+from src.graphics.null_display import NullDisplay
+from src.pacman.ghost_agents import GreedyGhost
+from src.pacman.rl import (
+    BatchEnv,
+    BatchTrainer,
+    DQNAgent,
+    DQNAgentConfig,
+    DQNConfig,
+    EpsParams,
+    ModelConfig,
+)
+from src.pacman.rules import GameRules
+from src.utils.layout import Layout
+from src.utils.timer import Timer
+
+SIZE = 15
+NUM_GHOSTS = 2
+NUM_ENVS = 32
+NUM_STEPS = 3000
+
+
+def new_layout() -> Layout:
+    return Layout.generate(
+        height=SIZE, width=SIZE, num_food=10, num_ghosts=NUM_GHOSTS
+    )
+
+
+def new_config(model_path: Path, train_start: int) -> DQNAgentConfig:
+    return DQNAgentConfig(
+        model=ModelConfig(
+            dqn=DQNConfig(width=SIZE, height=SIZE, in_channels=4),
+            memory=10000,
+            lr=2e-4,
+            batch_size=64,
+            gamma=0.999,
+            update_step=200,
+            model_path=str(model_path),
+            train_start=train_start,
+            print_every=10 ** 9,
+            device="cpu",
+        ),
+        eps_params=EpsParams(start=0.9, end=0.05, step=10000),
+        train=True,
+    )
+
+
+def play_games(config: DQNAgentConfig) -> tuple[int, int]:
+    agent = DQNAgent(config)
+    rules = GameRules()
+    while agent.step < NUM_STEPS:
+        game = rules.new_game(
+            layout=new_layout(),
+            pacman_agent=agent,
+            ghost_agents=[GreedyGhost(idx + 1) for idx in range(NUM_GHOSTS)],
+            display=NullDisplay(),
+            log_path=None,
+        )
+        game.run()
+    return agent.step, agent.model.step
+
+
+def play_batch(
+    config: DQNAgentConfig, transitions_per_update: int
+) -> tuple[int, int]:
+    env = BatchEnv(new_layout, NUM_ENVS, NUM_GHOSTS, seed=0)
+    trainer = BatchTrainer(config, env, transitions_per_update)
+    trainer.run(NUM_STEPS // NUM_ENVS)
+    return trainer.num_transitions, trainer.model.step
+
+
+def main() -> None:
+    # Training is compared at equal optimizer steps per transition first;
+    # one update per env step trains NUM_ENVS times less per transition
+    for label, train_start in [("acting", 10 ** 9), ("training", 500)]:
+        for name, play in [
+            ("game.run", play_games),
+            ("batch env", partial(play_batch, transitions_per_update=1)),
+            (
+                "batch env, 1 update/step",
+                partial(play_batch, transitions_per_update=NUM_ENVS),
+            ),
+        ]:
+            seed_all(0)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                config = new_config(Path(tmp_dir) / "model.pth", train_start)
+                timer = Timer()
+                timer.start()
+                # Games print their results and the agent its q values
+                with contextlib.redirect_stdout(io.StringIO()):
+                    steps, updates = play(config)
+                timer.stop()
+            report(f"{name} ({label})", steps, timer.elapsed, "steps")
+            if updates > 0:
+                report("  optimizer", updates, timer.elapsed, "updates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import random
+
+from .common import new_state, seed_all
+from src.pacman.ghost_agents import GreedyGhost
+from src.pacman.multiagent.agents import ExpectimaxAgent
+from src.pacman.rules import GameState
+from src.utils.layout import Layout
+from src.utils.timer import Timer
+
+NUM_DECISIONS = 10
+# Bounds of utility_fn: distance terms stay within dist_mult / EPS and the
+# food term within food_mult
+UTILITY_BOUNDS = (-1.1e5, 1.1e5)
+
+CONFIGS = {
+    "plain": {},
+    "chance cache": dict(table_size=2 ** 16),
+    "star1": dict(utility_bounds=UTILITY_BOUNDS),
+    "star1 + cache": dict(table_size=2 ** 16, utility_bounds=UTILITY_BOUNDS),
+    "2 samples + cache": dict(table_size=2 ** 16, max_samples=2),
+    "greedy model + cache": dict(table_size=2 ** 16, ghost_model=GreedyGhost),
+}
+
+
+def get_states(layout: Layout, num_ghosts: int) -> list[GameState]:
+    # Positions along a random walk, so consecutive searches overlap the
+    # way they do in a game
+    state, states = new_state(layout, num_ghosts), []
+    while len(states) < NUM_DECISIONS:
+        for agent in range(state.get_num_agents()):
+            action = random.choice(state.get_legal_actions(agent))
+            state = state.generate_next(agent, action)
+        if state.is_win() or state.is_lose():
+            state = new_state(layout, num_ghosts)
+            continue
+        states.append(state)
+    return states
+
+
+def main(depth: int = 4, num_ghosts: int = 3) -> None:
+    seed_all()
+    layout = Layout.generate(
+        height=21, width=21, num_food=20, num_ghosts=num_ghosts
+    )
+    states = get_states(layout, num_ghosts)
+    for label, kwargs in CONFIGS.items():
+        seed_all()
+        agent = ExpectimaxAgent(depth=depth, **kwargs)
+        agent.register_state(states[0])
+
+        timer = Timer()
+        timer.start()
+        for state in states:
+            agent.get_action(state)
+        timer.stop()
+
+        nodes = sum(stat.nodes for stat in agent.stats) / NUM_DECISIONS
+        print(
+            f"{label:<22} depth {depth} {num_ghosts} ghosts",
+            f"{nodes:>9.0f} nodes {1e3 * timer.elapsed / NUM_DECISIONS:>8.1f}",
+            "ms/decision",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from .common import measure, new_state, report
+from src.pacman.multiagent.states import ReflexState
+from src.pacman.multiagent.utilities import utility_fn
+from src.pacman.search.heuristics import all_food_heuristic
+from src.pacman.search.problems import AllFoodProblem
+from src.utils.bitboard import BitGrid
+from src.utils.layout import Layout
+
+NUM_CALLS = 20000
+
+
+def repeat(fn) -> int:
+    for _ in range(NUM_CALLS):
+        fn()
+    return NUM_CALLS
+
+
+def main(name: str = "big") -> None:
+    layout = Layout.from_text(name)
+    state = new_state(layout)
+    food = layout.food
+    bit_food = BitGrid.from_grid(food)
+
+    for label, fn in [
+        ("numpy count", food.count),
+        ("bitboard count", bit_food.count),
+        ("incremental get_num_food", state.get_num_food),
+        ("numpy get_positions", food.get_positions),
+        ("bitboard get_positions", bit_food.get_positions),
+        ("incremental get_food_sources", state.get_food_sources),
+    ]:
+        count, elapsed = measure(lambda: repeat(fn))
+        report(f"{name}.lay {label}", count, elapsed, "calls")
+
+    maze_dists = layout.get_maze_dists()
+    reflex_state = ReflexState(state)
+    count, elapsed = measure(
+        lambda: repeat(lambda: utility_fn(reflex_state, maze_dists))
+    )
+    report(f"{name}.lay utility_fn", count, elapsed, "calls")
+
+    problem = AllFoodProblem(state)
+    start = problem.get_start()
+    count, elapsed = measure(
+        lambda: repeat(lambda: all_food_heuristic(start, problem))
+    )
+    report(f"{name}.lay all_food_heuristic", count, elapsed, "calls")
+
+
+if __name__ == "__main__":
+    main()
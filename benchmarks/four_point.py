@@ -0,0 +1,29 @@
+from .common import new_state
+from .solvers import count_expansions
+from src.pacman.search.heuristics import four_point_heuristic
+from src.pacman.search.problems import FourPointProblem
+from src.pacman.search.solvers import a_star
+from src.utils.layout import Layout
+from src.utils.timer import Timer
+
+
+def main() -> None:
+    for name in ["corners", "big"]:
+        state = new_state(Layout.from_text(name), 0)
+        points = state.get_food_sources()[:4]
+        problem = FourPointProblem(state, points=points)
+        counter = count_expansions(problem)
+        timer = Timer()
+        timer.start()
+        moves = len(a_star(problem, heuristic=four_point_heuristic))
+        timer.stop()
+        expansions = counter[0]
+        print(
+            f"{name + '.lay':<12} {moves:>4} moves {expansions:>6} expansions",
+            f"{timer.elapsed:>8.4f}s",
+            f"{1e6 * timer.elapsed / expansions:>7.1f} us/expansion",
+        )
+
+
+if __name__ == "__main__":
+    main()
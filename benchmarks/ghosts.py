@@ -0,0 +1,74 @@
+import random
+from functools import partial
+from typing import Optional
+
+from .common import new_state, seed_all
+from src.pacman.ghost_agents import GreedyGhost, SearchFn
+from src.pacman.search.heuristics import distance_heuristic
+from src.pacman.search.solvers import (
+    a_star,
+    bidirectional_bfs,
+    jump_point_search,
+)
+from src.utils.layout import Layout
+from src.utils.timer import Timer
+from src.utils.vector import Point
+
+NUM_GHOSTS = 4
+MAX_MOVES = 100
+SEARCH_FNS = {
+    "distance field": None,
+    "greedy a*": partial(a_star, heuristic=distance_heuristic, greedy=True),
+    "a*": partial(a_star, heuristic=distance_heuristic),
+    "bidirectional bfs": bidirectional_bfs,
+    "jump point search": jump_point_search,
+}
+
+
+def add_ghosts(layout: Layout, num_ghosts: int) -> None:
+    # Spawn the ghosts in the cells farthest from the layout origin
+    positions = layout.get_neighbor_table().positions
+    farthest = sorted(positions, key=lambda position: -sum(position))
+    for position in farthest[:num_ghosts]:
+        layout.agent_positions.append((False, Point(*position)))
+
+
+def play(label: str, search_fn: Optional[SearchFn], layout: Layout) -> None:
+    seed_all(0)
+    rng = random.Random(0)
+    state = new_state(layout, NUM_GHOSTS)
+    ghosts = [GreedyGhost(idx, search_fn) for idx in range(1, NUM_GHOSTS + 1)]
+    latencies = []
+    for _ in range(MAX_MOVES):
+        if state.is_win() or state.is_lose():
+            break
+        actions = state.get_legal_actions(0)
+        state = state.generate_next(0, rng.choice(actions))
+        for ghost in ghosts:
+            if state.is_win() or state.is_lose():
+                break
+            timer = Timer()
+            timer.start()
+            action = ghost.get_action(state)
+            timer.stop()
+            latencies.append(timer.elapsed)
+            state = state.generate_next(ghost.index, action)
+
+    print(
+        f"{label:<20} {len(latencies):>4} decisions",
+        f"mean {1e3 * sum(latencies) / len(latencies):>7.3f} ms",
+        f"max {1e3 * max(latencies):>7.3f} ms",
+    )
+
+
+def main(name: str = "big") -> None:
+    layout = Layout.from_text(name)
+    add_ghosts(layout, NUM_GHOSTS)
+    # Games load the distance table with the layout, before the first move
+    layout.get_maze_dists()
+    for label, search_fn in SEARCH_FNS.items():
+        play(label, search_fn, layout)
+
+
+if __name__ == "__main__":
+    main()
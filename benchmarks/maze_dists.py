@@ -0,0 +1,61 @@
+import tempfile
+from pathlib import Path
+
+from .common import measure, report, seed_all
+from src.utils import layout as layouts
+from src.utils.graph import get_all_maze_dists, walls_to_csr
+from src.utils.layout import Layout
+
+
+def get_layouts() -> dict[str, Layout]:
+    seed_all()
+    return {
+        "medium.lay": Layout.from_text("medium"),
+        "big.lay": Layout.from_text("big"),
+        "generated 61x61": Layout.generate(height=61, width=61, num_food=10),
+        "generated 501x501": Layout.generate(
+            height=500, width=500, num_food=10
+        ),
+    }
+
+
+def bench_build(name: str, layout: Layout, cache_dir: Path) -> None:
+    walls = layout.get_bit_walls()
+    num_cells = walls.invert().count()
+
+    def graph() -> int:
+        walls_to_csr(walls)
+        return num_cells
+
+    def sparse() -> int:
+        get_all_maze_dists(walls)
+        return num_cells
+
+    def memoized() -> int:
+        layouts.MAZE_DISTS.clear()
+        layout.get_maze_dists(cache_dir)
+        for _ in range(99):
+            layout.get_maze_dists(cache_dir)
+        return 100
+
+    for label, fn, unit in [
+        ("sparse graph", graph, "cells"),
+        ("sparse bfs", sparse, "cells"),
+        ("memoized + mmap", memoized, "lookups"),
+    ]:
+        count, elapsed = measure(fn)
+        report(f"{name} {label}", count, elapsed, unit)
+
+    maze_dists = layout.get_maze_dists()
+    table = maze_dists.maze_dists
+    print(f"{name} {type(maze_dists).__name__} {table.dtype}")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, layout in get_layouts().items():
+            bench_build(name, layout, Path(cache_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import time
+from typing import Callable
+
+from .common import new_state, seed_all
+from src.pacman.agent import Agent
+from src.pacman.ghost_agents import RandomGhost
+from src.pacman.multiagent.agents import MinimaxAgent
+from src.pacman.multiagent.mcts import MCTSAgent
+from src.utils.layout import Layout
+
+NUM_GAMES = 8
+MAX_MOVES = 200
+
+
+def play(agent: Agent, layout: Layout, seed: int) -> tuple[float, bool]:
+    seed_all(seed)
+    state = new_state(layout, layout.num_ghosts)
+    agent.register_state(state)
+    ghosts = [RandomGhost(idx) for idx in range(1, state.get_num_agents())]
+    for _ in range(MAX_MOVES):
+        for mover in [agent, *ghosts]:
+            if state.is_win() or state.is_lose():
+                return state.get_score(), state.is_win()
+            action = mover.get_action(state)
+            state = state.generate_next(mover.index, action)
+    return state.get_score(), state.is_win()
+
+
+def evaluate(label: str, build: Callable[[], Agent], layout: Layout) -> None:
+    scores, wins, cpu, moves = [], 0, 0.0, 0
+    for seed in range(NUM_GAMES):
+        agent = build()
+        start = time.process_time()
+        score, win = play(agent, layout, seed)
+        cpu += time.process_time() - start
+        scores.append(score)
+        wins += win
+        moves += len(agent.stats)
+    mean = sum(scores) / len(scores)
+    print(
+        f"{label:<24} score {mean:>8.1f} wins {wins}/{NUM_GAMES}",
+        f"{1e3 * cpu / moves:>7.1f} cpu ms/move",
+    )
+
+
+def main(name: str = "medium") -> None:
+    layout = Layout.from_text(name)
+    for move_time in [0.02, 0.05]:
+        label = f"{1e3 * move_time:.0f} ms"
+        evaluate(
+            f"minimax {label}",
+            lambda: MinimaxAgent(depth=10, move_time=move_time),
+            layout,
+        )
+        evaluate(
+            f"mcts {label}",
+            lambda: MCTSAgent(move_time=move_time),
+            layout,
+        )
+
+
+if __name__ == "__main__":
+    main()
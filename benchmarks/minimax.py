@@ -0,0 +1,53 @@
+from .common import new_state, seed_all
+from src.pacman.ghost_agents import GreedyGhost
+from src.pacman.multiagent.agents import MinimaxAgent
+from src.pacman.rules import GameState
+from src.utils.layout import Layout
+
+NUM_MOVES = 15
+
+
+def play(agent: MinimaxAgent, state: GameState, seed: int = 0) -> None:
+    seed_all(seed)
+    agent.register_state(state)
+    ghosts = [GreedyGhost(idx) for idx in range(1, state.get_num_agents())]
+    for _ in range(NUM_MOVES):
+        for mover in [agent, *ghosts]:
+            if state.is_win() or state.is_lose():
+                return
+            action = mover.get_action(state)
+            state = state.generate_next(mover.index, action)
+
+
+def summarize(label: str, agent: MinimaxAgent) -> None:
+    stats = agent.stats
+    nodes = sum(stat.nodes for stat in stats)
+    elapsed = sum(stat.elapsed for stat in stats)
+    probes = sum(stat.probes for stat in stats)
+    hits = sum(stat.hits for stat in stats)
+    hit_rate = hits / probes if probes > 0 else 0.0
+    print(
+        f"{label:<28} {len(stats):>3} moves {nodes:>8} nodes",
+        f"{1e3 * elapsed / len(stats):>8.1f} ms/move",
+        f"{nodes / elapsed:>9.0f} nodes/s hit rate {hit_rate:.1%}",
+    )
+
+
+def main(name: str = "big", num_ghosts: int = 2) -> None:
+    layout = Layout.from_text(name)
+    layout.num_ghosts = min(layout.num_ghosts, num_ghosts)
+    for depth in [3, 4, 5]:
+        for label, table_size in [("plain", None), ("transposition", 2 ** 16)]:
+            agent = MinimaxAgent(depth=depth, table_size=table_size)
+            play(agent, new_state(layout, layout.num_ghosts))
+            summarize(f"{name}.lay depth {depth} {label}", agent)
+
+    for move_time in [0.005, 0.02]:
+        agent = MinimaxAgent(depth=10, move_time=move_time, table_size=2 ** 16)
+        play(agent, new_state(layout, layout.num_ghosts))
+        summarize(f"{name}.lay {1e3 * move_time:.0f} ms budget", agent)
+        print(f"{'':<28} max depth {max(stat.depth for stat in agent.stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+
+from .common import new_state, seed_all
+from src.pacman.multiagent.agents import ExpectimaxAgent, MinimaxAgent
+from src.utils.layout import Layout
+from src.utils.timer import Timer
+
+NUM_DECISIONS = 5
+
+
+def time_decisions(agent: MinimaxAgent, layout: Layout) -> float:
+    state = new_state(layout, layout.num_ghosts)
+    agent.register_state(state)
+    agent.get_action(state)  # warm up the workers
+
+    timer = Timer()
+    timer.start()
+    for _ in range(NUM_DECISIONS):
+        agent.get_action(state)
+    timer.stop()
+    return timer.elapsed / NUM_DECISIONS
+
+
+def main(depth: int = 6) -> None:
+    seed_all()
+    layout = Layout.generate(height=31, width=31, num_food=20, num_ghosts=2)
+    print(f"{os.cpu_count()} CPUs available")
+    for agent_type in [MinimaxAgent, ExpectimaxAgent]:
+        baseline = None
+        for num_workers in [1, 2, 4, 8]:
+            agent = agent_type(depth=depth, num_workers=num_workers)
+            elapsed = time_decisions(agent, layout)
+            baseline = baseline or elapsed
+            print(
+                f"{agent_type.__name__:<16} depth {depth}",
+                f"{num_workers} workers {1e3 * elapsed:>9.1f} ms/decision",
+                f"speedup {baseline / elapsed:.2f}x",
+            )
+            if agent.pool is not None:
+                agent.pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+from .common import new_state, seed_all
+from src.pacman.ghost_agents import RandomGhost
+from src.pacman.search.agents import ReplanningAgent
+from src.utils.layout import Layout
+from src.utils.timer import Timer
+
+MAX_MOVES = 300
+
+
+class ScratchAgent(ReplanningAgent):
+    # Same policy, but the plan is rebuilt before every move
+    def get_action(self, game_state) -> int:
+        expansions = self.planner.expansions
+        self.register_state(game_state)
+        self.planner.expansions += expansions
+        return super().get_action(game_state)
+
+
+def play(agent: ReplanningAgent, layout: Layout, seed: int = 0) -> None:
+    seed_all(seed)
+    state = new_state(layout, layout.num_ghosts)
+    agent.register_state(state)
+    ghosts = [RandomGhost(idx) for idx in range(1, state.get_num_agents())]
+    latencies = []
+    for _ in range(MAX_MOVES):
+        for mover in [agent, *ghosts]:
+            if state.is_win() or state.is_lose():
+                break
+            timer = Timer()
+            timer.start()
+            action = mover.get_action(state)
+            timer.stop()
+            if mover is agent:
+                latencies.append(timer.elapsed)
+            state = state.generate_next(mover.index, action)
+
+    print(
+        f"{type(agent).__name__:<16} score {state.get_score():>5}",
+        f"{len(latencies):>4} moves",
+        f"{agent.planner.expansions / len(latencies):>8.1f} expansions/move",
+        f"mean {1e3 * sum(latencies) / len(latencies):>6.3f} ms",
+        f"max {1e3 * max(latencies):>6.3f} ms",
+    )
+
+
+def main() -> None:
+    for name in ["medium", "big"]:
+        layout = Layout.from_text(name)
+        print(f"{name}.lay")
+        for agent_type in [ReplanningAgent, ScratchAgent]:
+            play(agent_type(), layout)
+
+
+if __name__ == "__main__":
+    main()
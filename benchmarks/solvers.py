@@ -0,0 +1,111 @@
+import tracemalloc
+
+import random
+
+from .common import measure, new_state, report, seed_all
+from src.pacman.search.heuristics import (
+    all_food_heuristic,
+    distance_heuristic,
+    four_point_heuristic,
+)
+from src.pacman.search.problems import (
+    AllFoodProblem,
+    FourPointProblem,
+    PositionProblem,
+    SearchProblem,
+)
+from src.pacman.search.solvers import a_star
+from src.utils.data_structures import BucketQueue, HeapFrontier
+from src.utils.layout import Layout
+from src.utils.timer import Timer
+
+FRONTIERS = {
+    "heap": dict(frontier_type=HeapFrontier),
+    "heap tie-break": dict(frontier_type=HeapFrontier, tie_break=True),
+    "bucket": dict(frontier_type=BucketQueue),
+    "bucket tie-break": dict(frontier_type=BucketQueue, tie_break=True),
+}
+
+
+def count_expansions(problem: SearchProblem) -> list[int]:
+    counter = [0]
+    get_neighbors = problem.get_neighbors
+
+    def counted(parent):
+        counter[0] += 1
+        return get_neighbors(parent)
+
+    problem.get_neighbors = counted
+    return counter
+
+
+def run(label: str, problems: list[SearchProblem], heuristic) -> None:
+    counters = [count_expansions(problem) for problem in problems]
+    for name, kwargs in FRONTIERS.items():
+
+        def search() -> int:
+            return sum(
+                len(a_star(problem, heuristic=heuristic, **kwargs))
+                for problem in problems
+            )
+
+        tracemalloc.start()
+        moves = search()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Tracing slows the search down, so the rate is measured separately
+        for counter in counters:
+            counter[0] = 0
+        timer = Timer()
+        timer.start()
+        search()
+        timer.stop()
+        expansions = sum(counter[0] for counter in counters)
+        print(
+            f"{label:<18} {name:<16} {moves:>6} moves",
+            f"{expansions:>8} expansions",
+            f"{expansions / timer.elapsed:>8.0f} expansions/s",
+            f"peak {peak / 2 ** 20:>6.1f} MiB",
+        )
+
+
+def bench_ops(num_items: int = 100000, max_priority: int = 200) -> None:
+    # Priorities of a unit-cost A* frontier: small integers, mostly rising
+    seed_all()
+    priorities = sorted(
+        random.randrange(max_priority) for _ in range(num_items)
+    )
+    for name, kwargs in FRONTIERS.items():
+
+        def push_pop() -> int:
+            frontier = kwargs["frontier_type"](kwargs.get("tie_break", False))
+            for key, priority in enumerate(priorities):
+                frontier.push(key, key, priority)
+            while not frontier.is_empty():
+                frontier.pop()
+            return num_items
+
+        count, elapsed = measure(push_pop)
+        report(f"{name} push + pop", count, elapsed, "items")
+
+
+def main(name: str = "big", step: int = 5) -> None:
+    bench_ops()
+    state = new_state(Layout.from_text(name))
+    food = state.get_food_sources()
+    goals = state.get_walls().invert().get_positions()[::step]
+    run(
+        f"{name}.lay paths",
+        [PositionProblem(state, goal) for goal in goals],
+        distance_heuristic,
+    )
+    run(
+        f"{name}.lay 4 point",
+        [FourPointProblem(state, points=food[:4])],
+        four_point_heuristic,
+    )
+    run(f"{name}.lay all food", [AllFoodProblem(state)], all_food_heuristic)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import copy
+import random
+from typing import Callable
+
+from .common import measure, new_state, report, seed_all
+from src.pacman.rules import GameState
+from src.utils.layout import Layout
+
+Successor = Callable[[GameState, int, int], GameState]
+
+
+def cow_successor(state: GameState, agent_idx: int, action: int) -> GameState:
+    return state.generate_next(agent_idx, action)
+
+
+def deepcopy_successor(
+    state: GameState, agent_idx: int, action: int
+) -> GameState:
+    # Previous behaviour: every successor deep-copies food and agent states
+    shared = [state.data.layout, state.data.walls, state.data.action_table]
+    state = copy.deepcopy(state, memo={id(obj): obj for obj in shared})
+    return state.generate_next(agent_idx, action)
+
+
+def snapshot(state: GameState) -> tuple:
+    data = state.data
+    agents = tuple(
+        (
+            tuple(agent.get_position()),
+            agent.get_direction(),
+            agent.scared_timer,
+        )
+        for agent in data.agent_states
+    )
+    return (
+        agents,
+        data.food.data.tobytes(),
+        tuple(sorted(map(tuple, data.capsules))),
+        data.score,
+        data._win,
+        data._lose,
+    )
+
+
+def expand(
+    state: GameState, successor: Successor, steps: int, seed: int = 0
+) -> int:
+    # Expands every action along a random playout like a search tree would
+    rng = random.Random(seed)
+    count = 0
+    agent_idx = 0
+    for _ in range(steps):
+        if state.is_win() or state.is_lose():
+            break
+        actions = state.get_legal_actions(agent_idx)
+        for action in actions:
+            successor(state, agent_idx, action)
+            count += 1
+        state = successor(state, agent_idx, rng.choice(actions))
+        agent_idx = (agent_idx + 1) % state.get_num_agents()
+    return count
+
+
+def check_rules(state: GameState, steps: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    agent_idx = 0
+    for _ in range(steps):
+        if state.is_win() or state.is_lose():
+            break
+        before = snapshot(state)
+        actions = state.get_legal_actions(agent_idx)
+        for action in actions:
+            expected = deepcopy_successor(state, agent_idx, action)
+            actual = cow_successor(state, agent_idx, action)
+            assert snapshot(actual) == snapshot(expected), "Rules changed"
+        assert snapshot(state) == before, "Parent state was modified"
+        state = state.generate_next(agent_idx, rng.choice(actions))
+        agent_idx = (agent_idx + 1) % state.get_num_agents()
+
+
+def main(steps: int = 200) -> None:
+    layouts = {
+        "medium": Layout.from_text("medium"),
+        "big": Layout.from_text("big"),
+        "generated": Layout.generate(
+            height=31, width=31, num_food=40, num_capsules=2, num_ghosts=4
+        ),
+    }
+    for name, layout in layouts.items():
+        check_rules(new_state(layout), steps)
+        for label, successor in [
+            ("deepcopy", deepcopy_successor),
+            ("copy-on-write", cow_successor),
+        ]:
+            state = new_state(layout)
+            count, elapsed = measure(lambda: expand(state, successor, steps))
+            report(f"{name} {label}", count, elapsed, "successors")
+
+
+if __name__ == "__main__":
+    seed_all()
+    main()
@@ -0,0 +1,74 @@
+from typing import Callable
+
+from .common import measure, new_state, report
+from src.pacman.search.heuristics import distance_heuristic
+from src.pacman.search.problems import PositionProblem
+from src.pacman.search.solvers import a_star
+from src.utils.layout import Layout
+from src.utils.vector import Point, Vector
+
+NUM_OPS = 100000
+
+
+def run_ops(op: Callable, first, second) -> int:
+    for _ in range(NUM_OPS):
+        op(first, second)
+    return NUM_OPS
+
+
+def lookup(first, second) -> None:
+    mapping = {second: 0}
+    mapping[second]
+
+
+def unpack(first, second) -> None:
+    x, y = first
+
+
+OPS = {
+    "add": lambda first, second: first + second,
+    "sub": lambda first, second: first - second,
+    "as_int": lambda first, second: first.as_int(),
+    "manhattan": lambda first, second: first.manhattan(second),
+    "eq": lambda first, second: first == second,
+    "hash": lambda first, second: hash(first),
+    "dict lookup": lookup,
+    "unpack": unpack,
+}
+
+
+def bench_ops() -> None:
+    types = {"Vector": Vector, "Point": Point}
+    for name, op in OPS.items():
+        for label, type in types.items():
+            first, second = type(3, 4), type(1, 2)
+            count, elapsed = measure(lambda: run_ops(op, first, second))
+            report(f"{name} {label}", count, elapsed)
+
+
+def bench_a_star(name: str = "big", step: int = 5) -> None:
+    state = new_state(Layout.from_text(name))
+    goals = state.get_walls().invert().get_positions()[::step]
+
+    def search() -> int:
+        expansions = 0
+        for goal in goals:
+            problem = PositionProblem(state, goal)
+            get_neighbors = problem.get_neighbors
+
+            def counted(parent):
+                nonlocal expansions
+                expansions += 1
+                return get_neighbors(parent)
+
+            problem.get_neighbors = counted
+            a_star(problem, heuristic=distance_heuristic)
+        return expansions
+
+    count, elapsed = measure(search)
+    report(f"a_star {name}.lay", count, elapsed, "expansions")
+
+
+if __name__ == "__main__":
+    bench_ops()
+    bench_a_star()
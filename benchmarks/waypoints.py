@@ -0,0 +1,40 @@
+import random
+
+from .common import new_state
+from src.pacman.search.heuristics import waypoint_heuristic
+from src.pacman.search.problems import WaypointProblem
+from src.pacman.search.solvers import a_star, held_karp
+from src.utils.layout import Layout
+from src.utils.timer import Timer
+
+# Mask search is only practical for a handful of points
+MAX_A_STAR_POINTS = 6
+
+
+def measure(search_fn, problem: WaypointProblem) -> tuple[int, float]:
+    timer = Timer()
+    timer.start()
+    moves = len(search_fn(problem))
+    timer.stop()
+    return moves, timer.elapsed
+
+
+def main(name: str = "big") -> None:
+    state = new_state(Layout.from_text(name), 0)
+    # Points spread over the maze, the first pellets all sit in one corner
+    food = random.Random(0).sample(state.get_food_sources(), 15)
+    for num_points in range(4, 16):
+        problem = WaypointProblem(state, points=food[:num_points])
+        moves, elapsed = measure(held_karp, problem)
+        line = f"K={num_points:<3} held-karp {moves:>4} moves {elapsed:>8.4f}s"
+        if num_points <= MAX_A_STAR_POINTS:
+            problem = WaypointProblem(state, points=food[:num_points])
+            moves, elapsed = measure(
+                lambda problem: a_star(problem, waypoint_heuristic), problem
+            )
+            line += f"   a* {moves:>4} moves {elapsed:>8.4f}s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
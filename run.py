@@ -14,9 +14,10 @@ from src.pacman.rl import (
 )
 from src.pacman.ghost_agents import GreedyGhost, RandomGhost
 from src.pacman.rules import GameRules
-from src.graphics import display
+from src.graphics.null_display import NullDisplay
 from src.utils.layout import Layout
 from src.utils.parser import get_parser
+from src.utils.timer import Timer
 from src.consts.types import Params
 
 
@@ -53,9 +54,14 @@ def parse_args() -> tuple[Params, Params]:
     args["ghost_agents"] = [
         GreedyGhost(idx + 1) for idx in range(options.max_num_ghosts)
     ]
-    args["display"] = display.PacmanGraphics(
-        zoom=options.zoom, frame_time=options.frame_time
-    )
+    if options.headless:
+        args["display"] = NullDisplay()
+    else:
+        from src.graphics import display
+
+        args["display"] = display.PacmanGraphics(
+            zoom=options.zoom, frame_time=options.frame_time
+        )
     if options.seed is not None:
         random.seed(options.seed)
     args["log_path"] = Path(options.log_path)
@@ -83,7 +89,15 @@ if __name__ == "__main__":
     rules = GameRules()
 
     num_games = args.pop("num_games")
+    timer = Timer()
+    timer.start()
     for idx in range(num_games):
         args["layout"] = generate_layout(layout_params)
         game = rules.new_game(**args)
         game.run()
+    timer.stop()
+
+    print(
+        f"Played {num_games} games in {timer.elapsed:.2f}s",
+        f"({num_games / timer.elapsed:.2f} games/s)",
+    )
@@ -1,4 +1,4 @@
-from ..utils.vector import Vector
+from ..utils.vector import Point
 
 
 class Direction:
@@ -22,16 +22,16 @@ class Direction:
 
 
 TO_VECTOR = {
-    Direction.NORTH: Vector(0, 1),
-    Direction.SOUTH: Vector(0, -1),
-    Direction.EAST: Vector(1, 0),
-    Direction.WEST: Vector(-1, 0),
-    Direction.STOP: Vector(0, 0),
+    Direction.NORTH: Point(0, 1),
+    Direction.SOUTH: Point(0, -1),
+    Direction.EAST: Point(1, 0),
+    Direction.WEST: Point(-1, 0),
+    Direction.STOP: Point(0, 0),
 }
 
 
 class MazeMove:
-    LEFT = Vector(-2, 0)
-    RIGTH = Vector(2, 0)
-    UP = Vector(0, 2)
-    DOWN = Vector(0, -2)
+    LEFT = Point(-2, 0)
+    RIGTH = Point(2, 0)
+    UP = Point(0, 2)
+    DOWN = Point(0, -2)
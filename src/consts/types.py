@@ -1,14 +1,12 @@
 import numpy as np
 from typing import Union, Optional, Any
 
-from ..utils.vector import Vector
+from ..utils.vector import Point
 
-Position = Vector
+Position = Point
 Action = int
 Cost = Union[int, float]
-AdjList = dict[int, list[tuple[int, Cost]]]
-AdjMatrix = np.ndarray
-PosToIdx = dict[Position, int]
+CellIndex = np.ndarray
 TextMaze = list[list[str]]
 GameResult = dict[str, Optional[Any]]
 Params = dict[str, Any]
@@ -0,0 +1,12 @@
+from ..pacman.game import GameStateData
+
+
+class NullDisplay:
+    def init(self, state: GameStateData) -> None:
+        pass
+
+    def update(self, new_state: GameStateData) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
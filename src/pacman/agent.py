@@ -1,10 +1,10 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Union
 
 from ..consts.direction import Direction, TO_VECTOR
 from ..consts.types import Action
 from ..utils.grid import Grid
-from ..utils.vector import Vector
+from ..utils.vector import Point, Vector
 
 
 class Agent:
@@ -33,7 +33,10 @@ class Configuration:
         direction = Actions.vector_to_direction(vector)
         if direction == Direction.STOP:
             direction = self.direction
-        return Configuration(self.position + vector, direction)
+        position = self.position + vector
+        if not isinstance(position, Point) and position.is_int():
+            position = position.as_int()
+        return Configuration(position, direction)
 
 
 @dataclass(eq=False)
@@ -53,6 +56,13 @@ class AgentState:
     def get_direction(self) -> int:
         return self.configuration.get_direction()
 
+    def copy(self) -> "AgentState":
+        state = AgentState(
+            self.configuration, self.is_pacman, self.scared_timer
+        )
+        state.start = self.start
+        return state
+
 
 class Actions:
     EPS = 1e-3
@@ -60,15 +70,15 @@ class Actions:
     @staticmethod
     def get_possible_actions(config: Configuration, walls: Grid) -> list[int]:
         xy = config.get_position()
-        xy_int = xy.as_int(True)
-
-        if xy.manhattan(xy_int) > Actions.EPS:
-            return [config.get_direction()]
+        if not isinstance(xy, Point):
+            xy_int = xy.as_int(True)
+            if xy.manhattan(xy_int) > Actions.EPS:
+                return [config.get_direction()]
+            xy = xy_int
 
         actions = []
         for direction, vector in TO_VECTOR.items():
-            x, y = xy_int + vector
-            if not walls[x][y]:
+            if not walls[xy + vector]:
                 actions.append(direction)
 
         return actions
@@ -91,5 +101,9 @@ class Actions:
         return Direction.STOP
 
     @staticmethod
-    def direction_to_vector(direction: int, speed: float = 1.0) -> Vector:
+    def direction_to_vector(
+        direction: int, speed: float = 1.0
+    ) -> Union[Point, Vector]:
+        if speed == 1:
+            return TO_VECTOR[direction]
         return TO_VECTOR[direction] * speed
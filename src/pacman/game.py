@@ -1,15 +1,18 @@
-import copy
-from typing import Optional
+from typing import Any, Optional, Union
 from dataclasses import InitVar, dataclass
 
 from .agent import Agent, AgentState, Configuration
 from ..consts.direction import Direction
-from ..consts.types import Action, GameResult
-from ..utils.vector import Vector
+from ..consts.types import Action, GameResult, Position
+from ..utils.bitboard import BitGrid
+from ..utils.grid import Grid, Walls
+from ..utils.vector import Point, Vector
 from ..utils.layout import Layout
 from ..utils.logger import Logger
 from ..utils.timer import Timer
 
+PackedState = tuple
+
 
 @dataclass
 class GameStateData:
@@ -23,17 +26,57 @@ class GameStateData:
     score_change: int = 0
 
     def __post_init__(self, state: Optional["GameStateData"] = None) -> None:
+        # Food and agent states are shared with the parent state and
+        # copied only when this state changes them
+        self._own_food = False
+        self._own_agents = set()
         if state is not None:
-            self.food = copy.deepcopy(state.food)
-            self.capsules = state.capsules[:]
-            self.agent_states = copy.deepcopy(state.agent_states)
+            self.food = state.food
+            self.food_positions = state.food_positions
+            self.num_food = state.num_food
+            self.capsules = state.capsules
+            self.agent_states = state.agent_states[:]
             self.layout = state.layout
-            self._eaten = state._eaten
+            self.walls = state.walls
+            self.action_table = state.action_table
+            self._eaten = state._eaten[:]
             self.score = state.score
 
-    def initialize(self, layout: Layout, num_ghost_agents: int) -> None:
-        self.food = copy.deepcopy(layout.food)
-        self.capsules = layout.capsules[:]
+    def mutable_food(self) -> Grid:
+        if not self._own_food:
+            self.food = self.food.copy()
+            self._own_food = True
+        return self.food
+
+    def eat_food(self, position: Position) -> None:
+        self.mutable_food()[position] = False
+        self.food_positions = tuple(
+            food for food in self.food_positions if food != position
+        )
+        self.num_food -= 1
+
+    def eat_capsule(self, position: Position) -> None:
+        self.capsules = self.capsules - {position}
+
+    def mutable_agent_state(self, idx: int) -> AgentState:
+        if idx not in self._own_agents:
+            self.agent_states[idx] = self.agent_states[idx].copy()
+            self._own_agents.add(idx)
+        return self.agent_states[idx]
+
+    def initialize(
+        self, layout: Layout, num_ghost_agents: int, bitboard: bool = True
+    ) -> None:
+        if bitboard:
+            self.food = BitGrid.from_grid(layout.food)
+            self.walls = layout.get_bit_walls()
+        else:
+            self.food = layout.food.copy()
+            self.walls = layout.walls
+        self.food_positions = tuple(self.food.get_positions())
+        self.num_food = len(self.food_positions)
+        self.capsules = frozenset(layout.capsules)
+        self.action_table = layout.get_action_table()
         self.layout = layout
         self.score = 0
         self.score_change = 0
@@ -51,17 +94,78 @@ class GameStateData:
             )
         self._eaten = [False] * len(self.agent_states)
 
+    def pack(self) -> PackedState:
+        # Plain tuples of the parts that change during a game; the layout
+        # is expected to be known on the receiving side
+        agents = tuple(
+            (
+                tuple(agent.get_position()),
+                agent.get_direction(),
+                agent.scared_timer,
+                agent.is_pacman,
+                tuple(agent.start.get_position()),
+                agent.start.get_direction(),
+            )
+            for agent in self.agent_states
+        )
+        return (
+            isinstance(self.food, BitGrid),
+            tuple(tuple(food) for food in self.food_positions),
+            tuple(tuple(capsule) for capsule in self.capsules),
+            agents,
+            self.score,
+            self._win,
+            self._lose,
+            tuple(self._eaten),
+        )
+
+    @classmethod
+    def unpack(cls, packed: PackedState, layout: Layout) -> "GameStateData":
+        bitboard, food, capsules, agents, score, win, lose, eaten = packed
+        data = cls()
+        data.initialize(layout, 0, bitboard)
+
+        grid_type = BitGrid if bitboard else Grid
+        data.food = grid_type.full(layout.width, layout.height)
+        for position in food:
+            data.food[position] = True
+        data.food_positions = tuple(Point(*position) for position in food)
+        data.num_food = len(food)
+        data.capsules = frozenset(Point(*capsule) for capsule in capsules)
+
+        data.agent_states = []
+        for position, direction, scared, is_pacman, start, start_dir in agents:
+            agent = AgentState(
+                Configuration(to_position(position), direction),
+                is_pacman,
+                scared,
+            )
+            agent.start = Configuration(to_position(start), start_dir)
+            data.agent_states.append(agent)
+        data.score = score
+        data._win = win
+        data._lose = lose
+        data._eaten = list(eaten)
+        return data
+
+
+def to_position(xy: tuple[Any, Any]) -> Union[Point, Vector]:
+    x, y = xy
+    if type(x) is int and type(y) is int:
+        return Point(x, y)
+    return Vector(x, y)
+
 
 class Game:
     def __init__(
-        self, agents: list[Agent], display, rules, log_path: str
+        self, agents: list[Agent], display, rules, log_path: Optional[str]
     ) -> None:
         self.agentCrashed = False
         self.agents = agents
         self.display = display
         self.rules = rules
         self.game_over = False
-        self.logger = Logger(log_path)
+        self.logger = Logger(log_path) if log_path is not None else None
         self.timer = Timer()
         self.history = []
 
@@ -76,7 +180,7 @@ class Game:
             return result
         return None
 
-    def run(self) -> None:
+    def run(self) -> Optional[GameResult]:
         self.display.init(self.state.data)
         self.num_moves = 0
 
@@ -90,7 +194,7 @@ class Game:
 
         while self.game_over is False:
             agent = self.agents[agent_idx]
-            action = agent.get_action(copy.deepcopy(self.state))
+            action = agent.get_action(self.state)
 
             self.history.append((agent_idx, action))
             self.state = self.state.generate_next(agent_idx, action)
@@ -110,5 +214,6 @@ class Game:
         self.display.finish()
 
         result = self.__get_result()
-        if result is not None:
+        if result is not None and self.logger is not None:
             self.logger.log_result(result)
+        return result
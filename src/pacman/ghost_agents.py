@@ -1,16 +1,19 @@
+import math
+import numpy as np
 from collections import Counter
 from functools import partial
-from typing import Callable
+from typing import Callable, Optional
 
 from .search.problems import PositionProblem, SearchProblem
-from .search.heuristics import distance_heuristic
-from .search.solvers import a_star
 from .game import Agent
 from .rules import GameState
 from ..consts.direction import Direction
-from ..consts.types import Action
+from ..consts.game import INF_COST
+from ..consts.types import Action, Position
 from ..pacman.agent import Actions
-from ..utils.general import normalize, sample
+from ..utils.data_structures import MazeDistance, NodeArena
+from ..utils.general import get_arg_names, normalize, sample
+from ..utils.graph import NO_CELL
 
 
 class GhostAgent(Agent):
@@ -37,29 +40,57 @@ SearchFn = Callable[[SearchProblem], list[Action]]
 
 
 class GreedyGhost(GhostAgent):
+    # Without a search function the moves are scored by the maze distance
+    # field of Pacman's cell: one row of the per-layout distance table,
+    # which every ghost (and every ghost model in a search) shares
     def __init__(
-        self,
-        index: int,
-        search_fn: SearchFn = partial(
-            a_star, heuristic=distance_heuristic, greedy=True
-        ),
+        self, index: int, search_fn: Optional[SearchFn] = None
     ) -> None:
         super().__init__(index=index)
         self.search_fn = search_fn
+        # One search per legal action and move, so the nodes are recycled
+        if search_fn is not None and "arena" in get_arg_names(search_fn):
+            self.search_fn = partial(search_fn, arena=NodeArena())
 
     def get_distribution(self, state: GameState) -> dict[int, float]:
         ghost = state.get_ghost_position(self.index)
         dist = dict()
 
         pacman = state.get_pacman_position()
+        if self.search_fn is None:
+            maze_dists = state.get_layout().get_maze_dists()
+            field = maze_dists.get_row(maze_dists.get_cell(pacman.nearest()))
         for action in state.get_legal_actions(self.index):
 
             move = Actions.direction_to_vector(action)
             next_position = ghost + move
 
+            if self.search_fn is None:
+                dist[action] = -self.__get_field_dist(
+                    maze_dists, field, next_position
+                )
+                continue
             problem = PositionProblem(state, pacman, next_position)
             actions = self.search_fn(problem)
 
             dist[action] = -len(actions)
 
         return normalize(dist, softmax=True)
+
+    def __get_field_dist(
+        self, maze_dists: MazeDistance, field: np.ndarray, position: Position
+    ) -> float:
+        # A scared ghost may stand between two cells of a corridor
+        x, y = position
+        corners = {
+            (math.floor(x), math.floor(y)),
+            (math.ceil(x), math.ceil(y)),
+        }
+        dists = []
+        for corner_x, corner_y in corners:
+            if maze_dists.mapping[corner_x, corner_y] == NO_CELL:
+                continue
+            cell = maze_dists.get_cell((corner_x, corner_y))
+            gap = abs(x - corner_x) + abs(y - corner_y)
+            dists.append(field[cell].item() + gap)
+        return min(dists, default=INF_COST)
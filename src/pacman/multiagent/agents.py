@@ -1,19 +1,26 @@
+import random
+from collections import Counter
 from functools import partial
-from typing import Callable, Generator, Optional
+from typing import Any, Callable, Generator, Iterable, Optional, Type
 from dataclasses import dataclass, field
 
-from .states import ReflexState
+from .budget import BudgetExceeded, SearchBudget
+from .parallel import RootSplitPool
+from .states import ReflexState, SearchStats
+from .transposition import Bound, TableEntry, TranspositionTable, ZobristHasher
 from .utilities import utility_fn
 from ..agent import Agent
+from ..ghost_agents import GhostAgent
 from ..rules import GameState
 from ...consts.game import INF_COST
 from ...consts.types import Action, Cost
 from ...consts.direction import Direction
-from ...utils.graph import get_maze_dists
 from ...utils.general import get_arg_names
+from ...utils.timer import Timer
 
 StateGenerator = Generator[ReflexState, None, None]
 UtilityFn = Callable[[ReflexState], Cost]
+Weights = list[tuple[Action, float]]
 
 
 @dataclass(order=True)
@@ -24,37 +31,214 @@ class Value:
 
 class ReflexAgent(Agent):
     def __init__(
-        self, index: int = 0, depth: int = 3, utility: UtilityFn = utility_fn
+        self,
+        index: int = 0,
+        depth: int = 3,
+        utility: UtilityFn = utility_fn,
+        move_time: Optional[float] = None,
+        move_nodes: Optional[int] = None,
+        num_workers: int = 1,
+        table_size: Optional[int] = None,
+        verbose: bool = False,
     ) -> None:
         super().__init__(index=index)
         self.depth = depth
+        self.utility_fn = utility
         self.utility = utility
+        # With a budget the search deepens iteratively up to depth and
+        # returns the deepest completed result
+        self.budget = SearchBudget(move_time, move_nodes)
+        # Root splitting is off by default: a worker only pays off once it
+        # has a core of its own, and on a single core the pool makes
+        # decisions slower (see benchmarks/parallel.py)
+        self.num_workers = num_workers
+        self.pool = None
+        self.table = (
+            TranspositionTable(table_size) if table_size is not None else None
+        )
+        self.hasher = ZobristHasher()
+        self.verbose = verbose
+        self.stats: list[SearchStats] = []
+        self.nodes = 0
 
     def register_state(self, game_state: GameState) -> None:
-        walls = game_state.get_walls()
-        maze_dists = get_maze_dists(*walls.get_adjmatrix())
+        layout = game_state.get_layout()
+        maze_dists = layout.get_maze_dists()
+
+        if "maze_dists" in get_arg_names(self.utility_fn):
+            self.utility = partial(self.utility_fn, maze_dists=maze_dists)
+        self.stats = []
+        if self.table is not None:
+            self.table.clear()
 
-        if "maze_dists" in get_arg_names(self.utility):
-            self.utility = partial(self.utility, maze_dists=maze_dists)
+        if self.num_workers > 1:
+            if self.pool is None:
+                self.pool = RootSplitPool(
+                    self.num_workers, type(self), self._get_worker_kwargs()
+                )
+            self.pool.register(layout)
+
+    def get_action(self, game_state: GameState) -> Action:
+        timer = Timer()
+        probes, hits = self._get_table_counts()
+        self.nodes = 0
 
-    def _get_next_states(self, state: ReflexState) -> StateGenerator:
+        timer.start()
+        self.budget.start()
+        value, depth = None, 0
+        for limit in self._get_depths():
+            try:
+                value = self._search_root(
+                    ReflexState(game_state, agent=self.index), limit
+                )
+            except BudgetExceeded:
+                break
+            depth = limit
+        timer.stop()
+
+        new_probes, new_hits = self._get_table_counts()
+        self._report(
+            SearchStats(
+                depth=depth,
+                nodes=self.nodes,
+                elapsed=timer.elapsed,
+                probes=new_probes - probes,
+                hits=new_hits - hits,
+            )
+        )
+        return value.action
+
+    def _search(
+        self, state: ReflexState, limit: int, alpha: Cost = -INF_COST
+    ) -> Value:
+        raise NotImplementedError
+
+    def _search_root(self, state: ReflexState, limit: int) -> Value:
+        if self.pool is None:
+            return self._search(state, limit)
+
+        # The first child is searched here and its value bounds the
+        # children farmed out to the pool
+        first, *rest = self._get_next_states(state)
+        value = Value(self._search(first, limit).cost, first.action)
+        if not rest:
+            return value
+
+        results = self.pool.search(
+            state.game_state,
+            [next_state.action for next_state in rest],
+            limit,
+            value.cost,
+            self.budget,
+            self.nodes,
+        )
+        for action, cost, nodes in results:
+            self.nodes += nodes
+            if cost is None:
+                raise BudgetExceeded()
+            value = max(value, Value(cost, action))
+        return value
+
+    def _get_worker_kwargs(self) -> dict:
+        kwargs = dict(
+            index=self.index, depth=self.depth, utility=self.utility_fn
+        )
+        if self.table is not None:
+            kwargs.update(table_size=self.table.max_size)
+        return kwargs
+
+    def _get_depths(self) -> Iterable[int]:
+        if self.budget.is_limited():
+            return range(1, self.depth + 1)
+        return [self.depth]
+
+    def _get_table_counts(self) -> tuple[int, int]:
+        if self.table is None:
+            return 0, 0
+        return self.table.probes, self.table.hits
+
+    def _probe(
+        self, state: ReflexState, limit: int, alpha: Cost, beta: Cost
+    ) -> tuple[Optional[int], Optional[TableEntry], Optional[Value]]:
+        if self.table is None:
+            return None, None, None
+        key = self.hasher.hash(state.game_state, state.agent)
+        entry = self.table.get(key)
+        if entry is None or entry.depth < limit - state.depth:
+            return key, entry, None
+        if (
+            entry.bound == Bound.EXACT
+            or (entry.bound == Bound.LOWER and entry.cost >= beta)
+            or (entry.bound == Bound.UPPER and entry.cost <= alpha)
+        ):
+            return key, entry, Value(entry.cost, entry.action)
+        return key, entry, None
+
+    def _store(
+        self,
+        key: Optional[int],
+        state: ReflexState,
+        limit: int,
+        alpha: Cost,
+        beta: Cost,
+        value: Value,
+    ) -> None:
+        if key is None:
+            return
+        if value.cost <= alpha:
+            bound = Bound.UPPER
+        elif value.cost >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        depth = limit - state.depth
+        self.table.put(key, TableEntry(depth, value.cost, bound, value.action))
+
+    def _visit(self, limit: int) -> None:
+        self.nodes += 1
+        # The shallowest iteration always completes, so a move is found
+        if limit > 1:
+            self.budget.check(self.nodes)
+
+    def _report(self, stats: SearchStats) -> None:
+        self.stats.append(stats)
+        if self.verbose is True:
+            print(
+                f"Move {len(self.stats)}: depth {stats.depth},",
+                f"{stats.nodes} nodes, {stats.nodes_per_sec:.0f} nodes/s,",
+                f"hit rate {stats.hit_rate:.1%}",
+            )
+
+    def _get_next_states(
+        self, state: ReflexState, first: Optional[Action] = None
+    ) -> StateGenerator:
+        actions = state.game_state.get_legal_actions(state.agent)
+        if first is not None and first in actions:
+            actions.remove(first)
+            actions.insert(0, first)
+
+        for action in actions:
+            if action != Direction.STOP:
+                yield self._get_next_state(state, action)
+
+    def _get_next_state(
+        self, state: ReflexState, action: Action
+    ) -> ReflexState:
         num_agents = state.game_state.get_num_agents()
 
         depth = state.depth + (1 if state.agent == num_agents - 1 else 0)
         agent = (state.agent + 1) % num_agents
 
-        for action in state.game_state.get_legal_actions(state.agent):
-            if action != Direction.STOP:
-                game_state = state.game_state.generate_next(
-                    state.agent, action
-                )
-                next_state = ReflexState(game_state, agent, depth)
-                yield next_state
+        game_state = state.game_state.generate_next(state.agent, action)
+        return ReflexState(game_state, agent, depth)
 
-    def _is_terminate(self, state: ReflexState) -> bool:
+    def _is_terminate(
+        self, state: ReflexState, depth: Optional[int] = None
+    ) -> bool:
+        depth = self.depth if depth is None else depth
         return (
             True
-            if state.depth == self.depth
+            if state.depth == depth
             or state.game_state.is_win()
             or state.game_state.is_lose()
             else False
@@ -62,31 +246,55 @@ class ReflexAgent(Agent):
 
 
 class MinimaxAgent(ReflexAgent):
-    def get_action(self, game_state: GameState) -> Action:
-        value = self.__alpha_beta(
-            ReflexState(game_state, agent=self.index),
-            alpha=-INF_COST,
-            beta=INF_COST,
+    def _search(
+        self, state: ReflexState, limit: int, alpha: Cost = -INF_COST
+    ) -> Value:
+        return self.__alpha_beta(
+            state, alpha=alpha, beta=INF_COST, limit=limit
         )
-        return value.action
+
+    def _get_depths(self) -> Iterable[int]:
+        # A transposition table also turns on iterative deepening
+        if self.table is not None:
+            return range(1, self.depth + 1)
+        return super()._get_depths()
 
     def __alpha_beta(
-        self, state: ReflexState, alpha: Cost, beta: Cost
+        self, state: ReflexState, alpha: Cost, beta: Cost, limit: int
     ) -> Value:
-        if self._is_terminate(state):
+        self._visit(limit)
+        if self._is_terminate(state, limit):
             return Value(self.utility(state))
+
+        key, entry, value = self._probe(state, limit, alpha, beta)
+        if value is not None:
+            return value
+
+        first = entry.action if entry is not None else None
         if state.agent == 0:
-            return self.__max_value(state, alpha, beta)
-        return self.__min_value(state, alpha, beta)
+            value = self.__max_value(state, alpha, beta, limit, first)
+        else:
+            value = self.__min_value(state, alpha, beta, limit, first)
+
+        self._store(key, state, limit, alpha, beta, value)
+        return value
 
     def __max_value(
-        self, state: ReflexState, alpha: Cost, beta: Cost
+        self,
+        state: ReflexState,
+        alpha: Cost,
+        beta: Cost,
+        limit: int,
+        first: Optional[Action] = None,
     ) -> Value:
         value = Value(-INF_COST)
-        for next in self._get_next_states(state):
+        for next in self._get_next_states(state, first):
             value = max(
                 value,
-                Value(self.__alpha_beta(next, alpha, beta).cost, next.action),
+                Value(
+                    self.__alpha_beta(next, alpha, beta, limit).cost,
+                    next.action,
+                ),
             )
             if value.cost >= beta:
                 return value
@@ -94,13 +302,21 @@ class MinimaxAgent(ReflexAgent):
         return value
 
     def __min_value(
-        self, state: ReflexState, alpha: Cost, beta: Cost
+        self,
+        state: ReflexState,
+        alpha: Cost,
+        beta: Cost,
+        limit: int,
+        first: Optional[Action] = None,
     ) -> Value:
         value = Value(INF_COST)
-        for next in self._get_next_states(state):
+        for next in self._get_next_states(state, first):
             value = min(
                 value,
-                Value(self.__alpha_beta(next, alpha, beta).cost, next.action),
+                Value(
+                    self.__alpha_beta(next, alpha, beta, limit).cost,
+                    next.action,
+                ),
             )
             if value.cost <= alpha:
                 return value
@@ -112,35 +328,170 @@ class MinimaxAgent(ReflexAgent):
 
 
 class ExpectimaxAgent(ReflexAgent):
-    def get_action(self, game_state) -> Action:
-        value = self.__expectimax(ReflexState(game_state, agent=self.index))
-        return value.action
+    def __init__(
+        self,
+        ghost_model: Optional[Type[GhostAgent]] = None,
+        utility_bounds: Optional[tuple[Cost, Cost]] = None,
+        max_samples: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        # Ghosts move uniformly at random unless a ghost model is given
+        self.ghost_model = ghost_model
+        self.ghosts: dict[int, GhostAgent] = {}
+        # Known utility bounds enable star1 pruning of chance nodes,
+        # utilities outside of them are clipped. It is off by default: the
+        # bounds of utility_fn are too wide to cut much, and with a table
+        # the narrowed windows leave fewer exact values to reuse
+        self.utility_bounds = utility_bounds
+        self.max_samples = max_samples
+
+    def _search(
+        self, state: ReflexState, limit: int, alpha: Cost = -INF_COST
+    ) -> Value:
+        return self.__expectimax(state, limit, alpha, INF_COST)
+
+    def _get_worker_kwargs(self) -> dict:
+        kwargs = super()._get_worker_kwargs()
+        kwargs.update(
+            ghost_model=self.ghost_model,
+            utility_bounds=self.utility_bounds,
+            max_samples=self.max_samples,
+        )
+        return kwargs
+
+    def __evaluate(self, state: ReflexState) -> Cost:
+        cost = self.utility(state)
+        if self.utility_bounds is None:
+            return cost
+        lower, upper = self.utility_bounds
+        return min(max(cost, lower), upper)
+
+    def __expectimax(
+        self, state: ReflexState, limit: int, alpha: Cost, beta: Cost
+    ) -> Value:
+        self._visit(limit)
+        if self._is_terminate(state, limit):
+            return Value(self.__evaluate(state))
+
+        key, entry, value = self._probe(state, limit, alpha, beta)
+        if value is not None:
+            return value
 
-    def __expectimax(self, state: ReflexState) -> Value:
-        if self._is_terminate(state):
-            return Value(self.utility(state))
         if state.agent == 0:
-            return self.__max_value(state)
-        return self.__expectation(state)
+            first = entry.action if entry is not None else None
+            value = self.__max_value(state, limit, alpha, beta, first)
+        else:
+            value = self.__expectation(state, limit, alpha, beta)
+            if self.utility_bounds is None:
+                # Averages search every child in a full window
+                alpha, beta = -INF_COST, INF_COST
+        # Cut-off values only bound the node and bounds found in the narrow
+        # windows of star1 are rarely reused, so only exact values are stored
+        if alpha < value.cost < beta:
+            self._store(key, state, limit, alpha, beta, value)
+        return value
 
-    def __max_value(self, state: ReflexState) -> Value:
+    def __max_value(
+        self,
+        state: ReflexState,
+        limit: int,
+        alpha: Cost,
+        beta: Cost,
+        first: Optional[Action] = None,
+    ) -> Value:
         value = Value(-INF_COST)
-        for next_state in self._get_next_states(state):
+        for next_state in self._get_next_states(state, first):
             value = max(
                 value,
-                Value(self.__expectimax(next_state).cost, next_state.action),
+                Value(
+                    self.__expectimax(next_state, limit, alpha, beta).cost,
+                    next_state.action,
+                ),
             )
+            if value.cost >= beta:
+                return value
+            alpha = max(alpha, value.cost)
         return value
 
-    def __expectation(self, state: ReflexState) -> Value:
-        next_states = list(self._get_next_states(state))
-        value = Value()
+    def __expectation(
+        self, state: ReflexState, limit: int, alpha: Cost, beta: Cost
+    ) -> Value:
+        weights = self.__get_weights(state)
+        total_weight = sum(weight for _, weight in weights)
+        if self.utility_bounds is None:
+            return self.__average(state, limit, weights, total_weight)
 
-        for next_state in next_states:
-            value.cost += self.__expectimax(next_state).cost
+        # Star1: narrow every child's window by the bounds of the children
+        # left to search. Searches never start with a finite beta, so only
+        # fail-low cut-offs occur and star2 probing would not pay off
+        lower, upper = self.utility_bounds
+        total, rest_weight = 0.0, total_weight
+        for action, weight in weights:
+            rest_weight -= weight
+            child_alpha = (
+                alpha * total_weight - total - upper * rest_weight
+            ) / weight
+            child_beta = (
+                beta * total_weight - total - lower * rest_weight
+            ) / weight
+            cost = self.__expectimax(
+                self._get_next_state(state, action),
+                limit,
+                max(child_alpha, lower),
+                min(child_beta, upper),
+            ).cost
+            if cost <= child_alpha:
+                return Value(alpha)
+            if cost >= child_beta:
+                return Value(beta)
+            total += weight * cost
+        return Value(total / total_weight)
 
-        value.cost /= len(next_states)
+    def __average(
+        self,
+        state: ReflexState,
+        limit: int,
+        weights: Weights,
+        total_weight: float,
+    ) -> Value:
+        value = Value()
+        for action, weight in weights:
+            next_state = self._get_next_state(state, action)
+            cost = self.__expectimax(next_state, limit, -INF_COST, INF_COST)
+            value.cost += weight * cost.cost
+        value.cost /= total_weight
         return value
 
+    def __get_weights(self, state: ReflexState) -> Weights:
+        actions = [
+            action
+            for action in state.game_state.get_legal_actions(state.agent)
+            if action != Direction.STOP
+        ]
+        if self.ghost_model is None:
+            weights = [(action, 1) for action in actions]
+        else:
+            ghost = self.ghosts.get(state.agent)
+            if ghost is None:
+                ghost = self.ghosts[state.agent] = self.ghost_model(
+                    state.agent
+                )
+            dist = ghost.get_distribution(state.game_state)
+            weights = [
+                (action, dist[action])
+                for action in actions
+                if dist.get(action, 0) > 0
+            ]
+        if self.max_samples is not None and len(weights) > self.max_samples:
+            # Sampled successors are weighted by how often they were drawn
+            sampled = random.choices(
+                [action for action, _ in weights],
+                weights=[weight for _, weight in weights],
+                k=self.max_samples,
+            )
+            weights = list(Counter(sampled).items())
+        return weights
+
     def get_algo(self) -> Optional[str]:
         return "expectimax"
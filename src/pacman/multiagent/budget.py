@@ -0,0 +1,45 @@
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+@dataclass(eq=False)
+class SearchBudget:
+    move_time: Optional[float] = None
+    max_nodes: Optional[int] = None
+    deadline: float = field(init=False, default=0.0)
+
+    def is_limited(self) -> bool:
+        return self.move_time is not None or self.max_nodes is not None
+
+    def start(self) -> None:
+        if self.move_time is not None:
+            self.deadline = time.perf_counter() + self.move_time
+
+    def get_remaining(
+        self, nodes: int
+    ) -> tuple[Optional[float], Optional[int]]:
+        move_time = (
+            self.deadline - time.perf_counter()
+            if self.move_time is not None
+            else None
+        )
+        max_nodes = (
+            self.max_nodes - nodes if self.max_nodes is not None else None
+        )
+        return move_time, max_nodes
+
+    def is_exhausted(self, nodes: int) -> bool:
+        if self.max_nodes is not None and nodes > self.max_nodes:
+            return True
+        if self.move_time is not None and time.perf_counter() > self.deadline:
+            return True
+        return False
+
+    def check(self, nodes: int) -> None:
+        if self.is_exhausted(nodes):
+            raise BudgetExceeded()
@@ -0,0 +1,269 @@
+import math
+import random
+import numpy as np
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Optional, Type
+
+from .budget import SearchBudget
+from .parallel import WORKER, WorkerPool
+from .states import ReflexState, SearchStats
+from .utilities import utility_fn
+from ..agent import Actions, Agent
+from ..game import PackedState
+from ..ghost_agents import GhostAgent, RandomGhost
+from ..rules import GameState
+from ...consts.direction import Direction
+from ...consts.types import Action, Cost
+from ...utils.general import get_arg_names
+from ...utils.timer import Timer
+
+MAX_SEED = 2 ** 32
+DEFAULT_SIMULATIONS = 200
+# Bounds leaf utilities are clipped to, as wins and losses are infinite
+UTILITY_BOUNDS = (-1.1e5, 1.1e5)
+SearchTask = tuple[PackedState, int, Optional[float], Optional[int]]
+UtilityFn = Callable[[ReflexState], Cost]
+RootStats = dict[Action, tuple[int, float]]
+
+
+@dataclass(eq=False)
+class TreeNode:
+    visits: int = 0
+    total: float = 0.0
+    children: dict[Action, "TreeNode"] = field(default_factory=dict)
+
+    def get_mean(self) -> float:
+        return self.total / self.visits if self.visits > 0 else 0.0
+
+
+def run_search(task: SearchTask) -> RootStats:
+    packed, seed, move_time, num_simulations = task
+    random.seed(seed)
+    np.random.seed(seed)
+
+    agent = WORKER["agent"]
+    game_state = GameState.unpack(packed, WORKER["layout"])
+    agent.budget = SearchBudget(move_time, num_simulations)
+    root = TreeNode()
+    agent.search(game_state, root)
+    return {
+        action: (child.visits, child.total)
+        for action, child in root.children.items()
+    }
+
+
+class MCTSAgent(Agent):
+    # UCT over pacman moves; ghost replies are re-sampled on every
+    # simulation, so a node stands for a sequence of pacman actions
+    def __init__(
+        self,
+        index: int = 0,
+        move_time: Optional[float] = None,
+        num_simulations: Optional[int] = None,
+        utility: UtilityFn = utility_fn,
+        rollout_depth: int = 0,
+        exploration: float = 0.5,
+        reward_scale: float = 200.0,
+        ghost_policy: Type[GhostAgent] = RandomGhost,
+        num_workers: int = 1,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__(index=index)
+        if move_time is None and num_simulations is None:
+            num_simulations = DEFAULT_SIMULATIONS
+        self.budget = SearchBudget(move_time, num_simulations)
+        self.utility_fn = utility
+        self.utility = utility
+        self.rollout_depth = rollout_depth
+        self.exploration = exploration
+        self.reward_scale = reward_scale
+        self.ghost_policy = ghost_policy
+        self.ghosts: dict[int, GhostAgent] = {}
+        self.num_workers = num_workers
+        self.pool = None
+        self.root: Optional[TreeNode] = None
+        self.last_action: Optional[Action] = None
+        self.verbose = verbose
+        self.stats: list[SearchStats] = []
+
+    def register_state(self, game_state: GameState) -> None:
+        if "maze_dists" in get_arg_names(self.utility_fn):
+            maze_dists = game_state.get_layout().get_maze_dists()
+            self.utility = partial(self.utility_fn, maze_dists=maze_dists)
+        self.root = None
+        self.last_action = None
+        self.stats = []
+        if self.num_workers > 1:
+            if self.pool is None:
+                self.pool = WorkerPool(
+                    self.num_workers, type(self), self.__get_worker_kwargs()
+                )
+            self.pool.register(game_state.get_layout())
+
+    def get_action(self, game_state: GameState) -> Action:
+        timer = Timer()
+        timer.start()
+        if self.pool is None:
+            root = self.__reuse_tree()
+            simulations = self.search(game_state, root)
+        else:
+            root, simulations = self.__search_parallel(game_state)
+        timer.stop()
+
+        if root.children:
+            action = max(
+                root.children, key=lambda action: root.children[action].visits
+            )
+        else:
+            action = random.choice(self.__get_actions(game_state))
+        self.root, self.last_action = root, action
+        self.__report(
+            SearchStats(
+                depth=self.__get_depth(root),
+                nodes=simulations,
+                elapsed=timer.elapsed,
+            )
+        )
+        return action
+
+    def search(self, game_state: GameState, root: TreeNode) -> int:
+        self.budget.start()
+        simulations = 0
+        while not self.budget.is_exhausted(simulations + 1):
+            self.__simulate(game_state, root)
+            simulations += 1
+        return simulations
+
+    def __search_parallel(self, game_state: GameState) -> tuple[TreeNode, int]:
+        self.budget.start()
+        move_time, num_simulations = self.budget.get_remaining(0)
+        if num_simulations is not None:
+            num_simulations = max(num_simulations // self.num_workers, 1)
+        packed = game_state.pack()
+        tasks = [
+            (packed, random.randrange(MAX_SEED), move_time, num_simulations)
+            for _ in range(self.num_workers)
+        ]
+        # Root parallelism: independent trees are merged at the root only
+        root = TreeNode()
+        for stats in self.pool.map(run_search, tasks):
+            for action, (visits, total) in stats.items():
+                child = root.children.setdefault(action, TreeNode())
+                child.visits += visits
+                child.total += total
+                root.visits += visits
+                root.total += total
+        return root, root.visits
+
+    def __reuse_tree(self) -> TreeNode:
+        if self.root is not None and self.last_action in self.root.children:
+            return self.root.children[self.last_action]
+        return TreeNode()
+
+    def __simulate(self, game_state: GameState, root: TreeNode) -> None:
+        node, path, state = root, [root], game_state
+        while not (state.is_win() or state.is_lose()):
+            actions = self.__get_actions(state)
+            untried = [
+                action for action in actions if action not in node.children
+            ]
+            if untried:
+                action = random.choice(untried)
+                node.children[action] = node = TreeNode()
+                state = self.__step(state, action)
+                path.append(node)
+                break
+            action = self.__select(node, actions)
+            node = node.children[action]
+            state = self.__step(state, action)
+            path.append(node)
+
+        reward = self.__evaluate(self.__rollout(state)) / self.reward_scale
+        for node in path:
+            node.visits += 1
+            node.total += reward
+
+    def __select(self, node: TreeNode, actions: list[Action]) -> Action:
+        log_visits = math.log(node.visits)
+
+        def ucb(action: Action) -> float:
+            child = node.children[action]
+            exploration = math.sqrt(log_visits / child.visits)
+            return child.get_mean() + self.exploration * exploration
+
+        return max(actions, key=ucb)
+
+    def __evaluate(self, state: GameState) -> Cost:
+        # The score so far plus the utility of the reflex agents as the
+        # estimate of what is to come. Values do not depend on the root, so
+        # a reused subtree keeps its statistics
+        lower, upper = UTILITY_BOUNDS
+        cost = self.utility(ReflexState(state, agent=self.index))
+        return state.get_score() + min(max(cost, lower), upper)
+
+    def __rollout(self, state: GameState) -> GameState:
+        action = state.get_pacman_state().configuration.get_direction()
+        for _ in range(self.rollout_depth):
+            if state.is_win() or state.is_lose():
+                break
+            # Random walks that never turn back reach food far more often
+            reverse = Actions.reverse_direction(action)
+            actions = self.__get_actions(state)
+            forward = [action for action in actions if action != reverse]
+            action = random.choice(forward if forward else actions)
+            state = self.__step(state, action)
+        return state
+
+    def __step(self, state: GameState, action: Action) -> GameState:
+        state = state.generate_next(self.index, action)
+        for idx in range(1, state.get_num_agents()):
+            if state.is_win() or state.is_lose():
+                break
+            ghost_action = self.__sample_ghost(idx, state)
+            state = state.generate_next(idx, ghost_action)
+        return state
+
+    def __sample_ghost(self, idx: int, state: GameState) -> Action:
+        ghost = self.ghosts.get(idx)
+        if ghost is None:
+            ghost = self.ghosts[idx] = self.ghost_policy(idx)
+        # random.choices is much cheaper than numpy sampling of one action
+        dist = ghost.get_distribution(state)
+        if len(dist) == 0:
+            return Direction.STOP
+        return random.choices(list(dist), weights=list(dist.values()))[0]
+
+    def __get_actions(self, state: GameState) -> list[Action]:
+        actions = state.get_legal_actions(self.index)
+        moves = [action for action in actions if action != Direction.STOP]
+        return moves if moves else actions
+
+    def __get_depth(self, root: TreeNode) -> int:
+        depth, node = 0, root
+        while node.children:
+            node = max(node.children.values(), key=lambda child: child.visits)
+            depth += 1
+        return depth
+
+    def __get_worker_kwargs(self) -> dict:
+        return dict(
+            index=self.index,
+            utility=self.utility_fn,
+            rollout_depth=self.rollout_depth,
+            exploration=self.exploration,
+            reward_scale=self.reward_scale,
+            ghost_policy=self.ghost_policy,
+        )
+
+    def __report(self, stats: SearchStats) -> None:
+        self.stats.append(stats)
+        if self.verbose is True:
+            print(
+                f"Move {len(self.stats)}: {stats.nodes} simulations,",
+                f"{stats.nodes_per_sec:.0f} simulations/s,",
+                f"depth {stats.depth}",
+            )
+
+    def get_algo(self) -> Optional[str]:
+        return "monte carlo tree search"
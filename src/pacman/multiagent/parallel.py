@@ -0,0 +1,102 @@
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from .budget import BudgetExceeded, SearchBudget
+from .states import ReflexState
+from ..game import PackedState
+from ..rules import GameState
+from ...consts.types import Action, Cost
+from ...utils.layout import Layout
+
+ChildTask = tuple[
+    PackedState, Action, int, Cost, Optional[float], Optional[int]
+]
+ChildResult = tuple[Action, Optional[Cost], int]
+
+# Per-process search state, set once by the pool initializer
+WORKER: dict[str, Any] = {}
+
+
+def init_worker(layout: Layout, agent_type: type, agent_kwargs: dict) -> None:
+    agent = agent_type(**agent_kwargs)
+    game_state = GameState()
+    game_state.initialize(layout, 0)
+    agent.register_state(game_state)
+    WORKER.update(layout=layout, agent=agent)
+
+
+def search_child(task: ChildTask) -> ChildResult:
+    packed, action, limit, alpha, move_time, move_nodes = task
+    agent = WORKER["agent"]
+    game_state = GameState.unpack(packed, WORKER["layout"])
+
+    root = ReflexState(game_state, agent=agent.index)
+    agent.nodes = 0
+    agent.budget = SearchBudget(move_time, move_nodes)
+    agent.budget.start()
+    try:
+        value = agent._search(
+            agent._get_next_state(root, action), limit, alpha
+        )
+    except BudgetExceeded:
+        return action, None, agent.nodes
+    return action, value.cost, agent.nodes
+
+
+class WorkerPool:
+    # Worker processes outlive moves and games; they are restarted only
+    # when the layout changes, so each worker builds its maze tables once.
+    # They are shut down with the pool or, at the latest, at exit
+    def __init__(
+        self, num_workers: int, agent_type: type, agent_kwargs: dict
+    ) -> None:
+        self.num_workers = num_workers
+        self.agent_type = agent_type
+        self.agent_kwargs = agent_kwargs
+        self.executor = None
+        self.key = None
+        self.finalizer = None
+
+    def register(self, layout: Layout) -> None:
+        if layout.get_key() == self.key:
+            return
+        self.close()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            initializer=init_worker,
+            initargs=(layout, self.agent_type, self.agent_kwargs),
+        )
+        self.finalizer = weakref.finalize(self, self.executor.shutdown)
+        self.key = layout.get_key()
+
+    def map(self, fn: Callable, tasks: list) -> list:
+        return list(self.executor.map(fn, tasks))
+
+    def close(self) -> None:
+        if self.finalizer is not None:
+            self.finalizer()
+        self.executor = None
+        self.finalizer = None
+        self.key = None
+
+
+class RootSplitPool(WorkerPool):
+    def search(
+        self,
+        game_state: GameState,
+        actions: list[Action],
+        limit: int,
+        alpha: Cost,
+        budget: SearchBudget,
+        nodes: int,
+    ) -> list[ChildResult]:
+        move_time, move_nodes = budget.get_remaining(nodes)
+        if move_nodes is not None:
+            move_nodes //= len(actions)
+        packed = game_state.pack()
+        tasks = [
+            (packed, action, limit, alpha, move_time, move_nodes)
+            for action in actions
+        ]
+        return self.map(search_child, tasks)
@@ -13,3 +13,20 @@ class ReflexState:
     @property
     def action(self) -> Action:
         return self.game_state.get_last_action()
+
+
+@dataclass(eq=False)
+class SearchStats:
+    depth: int
+    nodes: int
+    elapsed: float
+    probes: int = 0
+    hits: int = 0
+
+    @property
+    def nodes_per_sec(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes > 0 else 0.0
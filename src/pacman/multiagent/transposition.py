@@ -0,0 +1,96 @@
+import random
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from ..rules import GameState
+from ...consts.types import Action, Cost, Position
+
+HASH_BITS = 64
+ZOBRIST_SEED = 0
+MAX_FOOD_HASHES = 4096
+
+
+class Bound:
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+
+@dataclass(eq=False)
+class TableEntry:
+    depth: int
+    cost: Cost
+    bound: int
+    action: Action
+
+
+class ZobristHasher:
+    # Keys are drawn lazily from a private generator, so hashing never
+    # consumes the global random state games are seeded with
+    def __init__(self, seed: int = ZOBRIST_SEED) -> None:
+        self.rng = random.Random(seed)
+        self.keys: dict[tuple, int] = {}
+        self.food_hashes: dict[tuple[Position, ...], int] = {}
+
+    def get_key(self, *feature) -> int:
+        key = self.keys.get(feature)
+        if key is None:
+            key = self.keys[feature] = self.rng.getrandbits(HASH_BITS)
+        return key
+
+    def hash_food(self, food: tuple[Position, ...]) -> int:
+        value = self.food_hashes.get(food)
+        if value is None:
+            value = 0
+            for position in food:
+                value ^= self.get_key("food", position)
+            if len(self.food_hashes) >= MAX_FOOD_HASHES:
+                self.food_hashes.clear()
+            self.food_hashes[food] = value
+        return value
+
+    def hash(self, game_state: GameState, agent: int) -> int:
+        data = game_state.data
+        value = self.get_key("agent", agent)
+        value ^= self.get_key("capsules", data.capsules)
+        value ^= self.hash_food(data.food_positions)
+        for idx, agent_state in enumerate(data.agent_states):
+            configuration = agent_state.configuration
+            # Ghosts may not reverse, so their direction changes the tree
+            direction = configuration.direction if idx > 0 else None
+            value ^= self.get_key(
+                idx,
+                configuration.position,
+                direction,
+                agent_state.scared_timer,
+            )
+        return value
+
+
+class TranspositionTable:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.entries: OrderedDict[int, TableEntry] = OrderedDict()
+        self.probes = 0
+        self.hits = 0
+
+    def get(self, key: int) -> Optional[TableEntry]:
+        self.probes += 1
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: int, entry: TableEntry) -> None:
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -13,25 +13,25 @@ def utility_fn(
 ) -> Cost:
     game_state = state.game_state
 
-    pacman = game_state.get_pacman_position()
-    food_dists = [
-        maze_dists.get(pacman, food) for food in game_state.get_food_sources()
-    ]
-    food_dist = clip(food_dists) if food_dists else EPS
-    ghost_dists = [
-        maze_dists.get(pacman, ghost)
-        for ghost in game_state.get_ghost_positions()
-    ]
-    ghost_dist = clip(ghost_dists) if ghost_dists else INF_COST
+    pacman = maze_dists.get_cell(game_state.get_pacman_position())
+    food = maze_dists.get_cells(game_state.get_food_sources())
+    food_dist = clip(maze_dists.min_to(pacman, food)) if len(food) else EPS
+    ghosts = maze_dists.get_cells(
+        [ghost.nearest() for ghost in game_state.get_ghost_positions()]
+    )
+    ghost_dist = (
+        clip(maze_dists.min_to(pacman, ghosts)) if len(ghosts) else INF_COST
+    )
     num_food = game_state.get_num_food()
+    food_score = food_mult / num_food if num_food > 0 else INF_COST
 
     game_score = (
         dist_mult / (food_dist if food_dist < 2 * ghost_dist else -ghost_dist)
-        + food_mult / num_food
+        + food_score
         + random.randint(-2, 2)
     )
     return game_score
 
 
-def clip(values: list[Cost], eps: float = EPS):
-    return max(min(values), eps)
+def clip(value: Cost, eps: float = EPS):
+    return max(value, eps)
@@ -1,3 +1,5 @@
 from .dqn.configs import ModelConfig, DQNConfig
 from .agents import DQNAgent
 from .config import DQNAgentConfig, EpsParams
+from .env import BatchEnv
+from .trainer import BatchTrainer
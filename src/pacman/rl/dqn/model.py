@@ -30,9 +30,12 @@ class Model:
         self.target_net.eval()
 
     def evaluate(self, state: np.ndarray) -> np.ndarray:
-        state = torch.tensor(state[np.newaxis, :], device=self.config.device)
+        return self.evaluate_batch(state[np.newaxis, :])[0]
+
+    def evaluate_batch(self, states: np.ndarray) -> np.ndarray:
+        states = torch.tensor(states, device=self.config.device)
         with torch.no_grad():
-            values = self.policy_net(state)[0]
+            values = self.policy_net(states)
         return to_numpy(values)
 
     def __get_train_batch(self) -> dict[str, torch.Tensor]:
@@ -50,6 +53,16 @@ class Model:
 
     def train(self, experience: Experience) -> None:
         self.memory.push(experience)
+        self.__optimize()
+
+    def train_batch(
+        self, experiences: list[Experience], num_updates: int = 1
+    ) -> None:
+        self.memory.extend(experiences)
+        for _ in range(num_updates):
+            self.__optimize()
+
+    def __optimize(self) -> None:
         config = self.config
 
         if len(self.memory) >= config.train_start:
@@ -11,6 +11,9 @@ class ReplayMemory:
     def push(self, experience: Experience) -> None:
         self.memory.append(experience)
 
+    def extend(self, experiences: list[Experience]) -> None:
+        self.memory.extend(experiences)
+
     def sample(self, batch_size: int) -> list[Experience]:
         return random.sample(self.memory, batch_size)
 
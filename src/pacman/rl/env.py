@@ -0,0 +1,218 @@
+import numpy as np
+from typing import Callable, Optional
+
+from .agents import ACTION_MAP
+from ...consts.direction import TO_VECTOR
+from ...consts.game import SCARED_TIME, TIME_PENALTY
+from ...utils.data_structures import MazeDistance
+from ...utils.graph import get_all_maze_dists
+from ...utils.layout import Layout
+
+# Moves in the order of the DQN action indices, so the reverse of move i
+# is move (i + 2) % 4
+MOVES = np.array(
+    [TO_VECTOR[ACTION_MAP[idx]] for idx in range(len(ACTION_MAP))]
+)
+NO_MOVE = -1
+FOOD_REWARD = 10
+WIN_REWARD = 500
+LOSE_PENALTY = 500
+GHOST_REWARD = 200
+
+Step = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+class BatchEnv:
+    # Plays N games of the same maze size in lockstep on numpy arrays. One
+    # step is a Pacman move followed by a move of every ghost, scored as in
+    # GameRules. Ghosts sample moves like GreedyGhost (or RandomGhost), and
+    # scared ghosts move every other step instead of at half speed
+    def __init__(
+        self,
+        layout_fn: Callable[[], Layout],
+        num_envs: int,
+        num_ghosts: int,
+        greedy: bool = True,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.layout_fn = layout_fn
+        self.num_envs = num_envs
+        self.num_ghosts = num_ghosts
+        self.greedy = greedy
+        self.rng = np.random.default_rng(seed)
+
+        self.layout = layout_fn()
+        self.shape = (self.layout.width, self.layout.height)
+        grid_shape = (num_envs, *self.shape)
+        ghost_shape = (num_envs, num_ghosts)
+        self.walls = np.zeros(grid_shape, dtype=bool)
+        self.food = np.zeros(grid_shape, dtype=bool)
+        self.capsules = np.zeros(grid_shape, dtype=bool)
+        self.maze_dists: list[Optional[MazeDistance]] = [None] * num_envs
+        self.pacman = np.zeros((num_envs, 2), dtype=np.int64)
+        self.ghosts = np.zeros((*ghost_shape, 2), dtype=np.int64)
+        self.ghost_starts = np.zeros((*ghost_shape, 2), dtype=np.int64)
+        self.ghost_moves = np.full(ghost_shape, NO_MOVE, dtype=np.int64)
+        self.active = np.zeros(ghost_shape, dtype=bool)
+        self.scared = np.zeros(ghost_shape, dtype=np.int64)
+        self.num_food = np.zeros(num_envs, dtype=np.int64)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+        # Final scores of the games played to the end, in finishing order
+        self.finished: list[int] = []
+        self.observations: Optional[np.ndarray] = None
+
+    def reset(self) -> np.ndarray:
+        for env in range(self.num_envs):
+            layout = self.layout if env == 0 else self.layout_fn()
+            self.__reset_env(env, layout)
+        self.observations = self.__observe()
+        return self.observations
+
+    def step(self, actions: np.ndarray) -> Step:
+        # Returns the observations the actions led to, rewards and terminal
+        # flags. Finished games restart at once, self.observations holds
+        # the states the next actions are chosen in
+        envs = np.arange(self.num_envs)
+        rewards = np.full(self.num_envs, -TIME_PENALTY, dtype=np.int64)
+
+        # Moves into walls leave Pacman in place, as DQNAgent stops then
+        targets = self.pacman + MOVES[actions]
+        blocked = self.walls[envs, targets[:, 0], targets[:, 1]]
+        self.pacman = np.where(blocked[:, np.newaxis], self.pacman, targets)
+        xs, ys = self.pacman[:, 0], self.pacman[:, 1]
+
+        eaten = self.food[envs, xs, ys]
+        self.food[envs, xs, ys] = False
+        self.num_food -= eaten
+        won = eaten & (self.num_food == 0)
+        rewards += FOOD_REWARD * eaten + WIN_REWARD * won
+
+        capsules = self.capsules[envs, xs, ys]
+        self.capsules[envs, xs, ys] = False
+        self.scared[capsules] = SCARED_TIME
+
+        lost = self.__collide(rewards, won)
+        playing = ~(won | lost)
+        self.__move_ghosts(playing)
+        lost |= self.__collide(rewards, ~playing)
+
+        terminals = won | lost
+        self.scores += rewards
+        next_states = self.__observe()
+        self.observations = next_states
+        if terminals.any():
+            self.observations = next_states.copy()
+            for env in np.flatnonzero(terminals).tolist():
+                self.finished.append(self.scores[env].item())
+                self.__reset_env(env, self.layout_fn())
+            self.observations[terminals] = self.__observe(terminals)
+        return next_states, rewards, terminals
+
+    def get_legal_moves(self) -> np.ndarray:
+        targets = self.pacman[:, np.newaxis] + MOVES
+        envs = np.arange(self.num_envs)[:, np.newaxis]
+        return ~self.walls[envs, targets[..., 0], targets[..., 1]]
+
+    def __reset_env(self, env: int, layout: Layout) -> None:
+        walls = np.asarray(layout.walls.data, dtype=bool)
+        assert walls.shape == self.shape, "Layouts must be of the same size"
+        self.walls[env] = walls
+        self.food[env] = np.asarray(layout.food.data, dtype=bool)
+        self.capsules[env] = False
+        for x, y in layout.capsules:
+            self.capsules[env, x, y] = True
+        if self.greedy:
+            # Every game gets a fresh maze, so its table is not kept in the
+            # per-layout cache
+            self.maze_dists[env] = get_all_maze_dists(layout.get_bit_walls())
+
+        pacman = [
+            pos for is_pacman, pos in layout.agent_positions if is_pacman
+        ]
+        ghosts = [
+            pos for is_pacman, pos in layout.agent_positions if not is_pacman
+        ][: min(layout.num_ghosts, self.num_ghosts)]
+        self.pacman[env] = pacman[0]
+        self.active[env] = False
+        self.active[env, : len(ghosts)] = True
+        if ghosts:
+            self.ghosts[env, : len(ghosts)] = ghosts
+        self.ghost_starts[env] = self.ghosts[env]
+        self.ghost_moves[env] = NO_MOVE
+        self.scared[env] = 0
+        self.num_food[env] = self.food[env].sum()
+        self.scores[env] = 0
+
+    def __collide(self, rewards: np.ndarray, done: np.ndarray) -> np.ndarray:
+        # Scared ghosts are eaten and respawn, any other one ends the game
+        hit = (self.ghosts == self.pacman[:, np.newaxis]).all(axis=2)
+        hit &= self.active & ~done[:, np.newaxis]
+        eaten = hit & (self.scared > 0)
+        self.ghosts[eaten] = self.ghost_starts[eaten]
+        self.ghost_moves[eaten] = NO_MOVE
+        self.scared[eaten] = 0
+
+        lost = (hit & ~eaten).any(axis=1)
+        rewards += GHOST_REWARD * eaten.sum(axis=1) - LOSE_PENALTY * lost
+        return lost
+
+    def __move_ghosts(self, playing: np.ndarray) -> None:
+        envs = np.arange(self.num_envs)[:, np.newaxis, np.newaxis]
+        targets = self.ghosts[:, :, np.newaxis] + MOVES
+        legal = ~self.walls[envs, targets[..., 0], targets[..., 1]]
+        # Ghosts turn back only in dead ends
+        reverse = np.where(
+            self.ghost_moves == NO_MOVE, NO_MOVE, (self.ghost_moves + 2) % 4
+        )
+        is_reverse = np.arange(len(MOVES)) == reverse[..., np.newaxis]
+        legal &= ~(is_reverse & (legal.sum(axis=2, keepdims=True) > 1))
+
+        logits = np.zeros(legal.shape)
+        if self.greedy:
+            logits = -self.__get_ghost_dists(targets, playing)
+        logits[~legal] = -np.inf
+        # Gumbel noise turns the argmax into a sample of softmax(logits)
+        moves = (logits + self.rng.gumbel(size=logits.shape)).argmax(axis=2)
+
+        moving = self.active & playing[:, np.newaxis] & legal.any(axis=2)
+        moving &= self.scared % 2 == 0
+        chosen = np.take_along_axis(
+            targets, moves[..., np.newaxis, np.newaxis], axis=2
+        )[:, :, 0]
+        self.ghosts = np.where(moving[..., np.newaxis], chosen, self.ghosts)
+        self.ghost_moves = np.where(moving, moves, self.ghost_moves)
+
+        scared = playing[:, np.newaxis] & (self.scared > 0)
+        self.scared[scared] -= 1
+
+    def __get_ghost_dists(
+        self, targets: np.ndarray, playing: np.ndarray
+    ) -> np.ndarray:
+        # The maze distance field of Pacman's cell, as GreedyGhost uses
+        dists = np.zeros(targets.shape[:3])
+        for env in np.flatnonzero(playing).tolist():
+            maze_dists = self.maze_dists[env]
+            x, y = self.pacman[env].tolist()
+            row = maze_dists.get_row(maze_dists.get_cell((x, y)))
+            cells = maze_dists.mapping[
+                targets[env, ..., 0], targets[env, ..., 1]
+            ]
+            # Wall cells map to -1; their moves are masked out afterwards
+            dists[env] = row[cells]
+        return dists
+
+    def __observe(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        # Channels match DQNAgent: pacman, ghosts, food and walls
+        envs = (
+            np.arange(self.num_envs) if mask is None else np.flatnonzero(mask)
+        )
+        rows = np.arange(len(envs))
+        observations = np.zeros((len(envs), 4, *self.shape), dtype=np.float32)
+        pacman = self.pacman[envs]
+        observations[rows, 0, pacman[:, 0], pacman[:, 1]] = 1
+        ghost_rows, ghost_idxs = np.nonzero(self.active[envs])
+        ghosts = self.ghosts[envs][ghost_rows, ghost_idxs]
+        observations[ghost_rows, 1, ghosts[:, 0], ghosts[:, 1]] = 1
+        observations[:, 2] = self.food[envs]
+        observations[:, 3] = self.walls[envs]
+        return observations
@@ -0,0 +1,79 @@
+import math
+import numpy as np
+
+from .config import DQNAgentConfig
+from .dqn.model import Model
+from .dqn.utils.experience import Experience
+from .env import BatchEnv
+
+
+class BatchTrainer:
+    # DQN training on a BatchEnv: the policy forward pass and replay
+    # insertion handle one state per game at every step. The model takes
+    # an optimizer step per transitions_per_update transitions, so the
+    # default of 1 trains as often as DQNAgent does on single games
+    def __init__(
+        self,
+        config: DQNAgentConfig,
+        env: BatchEnv,
+        transitions_per_update: int = 1,
+    ) -> None:
+        self.config = config
+        self.model = Model(config.model)
+        self.env = env
+        self.num_updates = math.ceil(env.num_envs / transitions_per_update)
+        self.eps = config.eps_params.start
+        self.step: int = 0
+        self.num_transitions: int = 0
+
+    def run(self, num_steps: int) -> list[int]:
+        # Returns the final scores of the games finished during the run
+        states = self.env.observations
+        if states is None:
+            states = self.env.reset()
+        num_finished = len(self.env.finished)
+
+        for _ in range(num_steps):
+            actions = self.__get_actions(states)
+            next_states, rewards, terminals = self.env.step(actions)
+            self.num_transitions += len(actions)
+            if self.config.train:
+                self.model.train_batch(
+                    [
+                        Experience(*transition)
+                        for transition in zip(
+                            states,
+                            actions.tolist(),
+                            next_states,
+                            rewards.tolist(),
+                            terminals.tolist(),
+                        )
+                    ],
+                    self.num_updates,
+                )
+                self.__update_eps()
+            states = self.env.observations
+            self.step += 1
+
+        if self.config.train:
+            self.model.save_checkpoint()
+        return self.env.finished[num_finished:]
+
+    def __update_eps(self) -> None:
+        # Decays with the transitions played rather than optimizer steps,
+        # so exploration does not depend on transitions_per_update
+        eps = self.config.eps_params
+        scale = eps.start - eps.end
+        ratio = max(0.0, 1 - self.num_transitions / eps.step)
+        self.eps = eps.end + scale * ratio
+
+    def __get_actions(self, states: np.ndarray) -> np.ndarray:
+        # Random legal moves for exploring games, greedy ones for the rest
+        legal = self.env.get_legal_moves()
+        scores = np.where(legal, np.random.rand(*legal.shape), -1.0)
+        actions = scores.argmax(axis=1)
+        greedy = np.random.rand(len(states)) > self.eps
+        if greedy.any():
+            values = self.model.evaluate_batch(states[greedy])
+            actions[greedy] = values.argmax(axis=1)
+        return actions
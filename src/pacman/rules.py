@@ -2,13 +2,13 @@ import numpy as np
 from dataclasses import InitVar, dataclass
 from typing import Optional
 
-from .game import GameStateData, Game
-from .agent import Agent, Actions, AgentState
+from .game import GameStateData, Game, PackedState
+from .agent import Agent, Actions, AgentState, Configuration
 from ..consts.game import *
 from ..consts.types import Action, Position
 from ..consts.direction import Direction
 from ..utils.layout import Layout
-from ..utils.vector import Vector
+from ..utils.vector import Point, Vector
 from ..utils.grid import Grid, Walls
 
 
@@ -22,6 +22,15 @@ class GameState:
         else:
             self.data = GameStateData(state.data)
 
+    def pack(self) -> PackedState:
+        return self.data.pack()
+
+    @classmethod
+    def unpack(cls, packed: PackedState, layout: Layout) -> "GameState":
+        state = cls()
+        state.data = GameStateData.unpack(packed, layout)
+        return state
+
     def get_legal_actions(self, agent_idx: int = 0) -> list[int]:
         if self.is_lose() or self.is_win():
             return []
@@ -45,7 +54,9 @@ class GameState:
         if agent_idx == 0:
             state.data.score_change -= TIME_PENALTY
         else:
-            GhostRules.decrement_timer(state.data.agent_states[agent_idx])
+            GhostRules.decrement_timer(
+                state.data.mutable_agent_state(agent_idx)
+            )
         GhostRules.check_death(state, agent_idx)
 
         state.data._agent_moved = agent_idx
@@ -60,8 +71,10 @@ class GameState:
     def is_win(self) -> bool:
         return self.data._win
 
-    def initialize(self, layout: Layout, num_ghost_agents: int) -> None:
-        self.data.initialize(layout, num_ghost_agents)
+    def initialize(
+        self, layout: Layout, num_ghost_agents: int, bitboard: bool = True
+    ) -> None:
+        self.data.initialize(layout, num_ghost_agents, bitboard)
 
     def get_agent_states(self) -> list[AgentState]:
         return self.data.agent_states
@@ -78,16 +91,19 @@ class GameState:
         return len(self.data.agent_states)
 
     def get_capsules(self) -> list[Position]:
-        return self.data.capsules
+        return list(self.data.capsules)
 
     def get_walls(self) -> Walls:
-        return self.data.layout.walls
+        return self.data.walls
+
+    def get_layout(self) -> Layout:
+        return self.data.layout
 
     def get_food(self) -> Grid:
         return self.data.food
 
     def get_num_food(self) -> int:
-        return self.data.food.count()
+        return self.data.num_food
 
     def get_pacman_position(self) -> Position:
         return self.get_pacman_state().get_position()
@@ -99,7 +115,7 @@ class GameState:
         return [ghost.get_position() for ghost in self.data.agent_states[1:]]
 
     def get_food_sources(self) -> list[Position]:
-        return self.data.food.get_positions()
+        return list(self.data.food_positions)
 
     def get_score(self) -> float:
         return self.data.score
@@ -130,17 +146,20 @@ class GameState:
 
 
 class GameRules:
+    def __init__(self, bitboard: bool = True) -> None:
+        self.bitboard = bitboard
+
     def new_game(
         self,
         layout: Layout,
         pacman_agent: list[Agent],
         ghost_agents: list[Agent],
         display,
-        log_path: str,
+        log_path: Optional[str],
     ) -> Game:
         agents = [pacman_agent] + ghost_agents[: layout.num_ghosts]
         state = GameState()
-        state.initialize(layout, len(ghost_agents))
+        state.initialize(layout, len(ghost_agents), self.bitboard)
         game = Game(agents, display, self, log_path)
         game.state = state
         return game
@@ -163,10 +182,12 @@ class GameRules:
 class PacmanRules:
     @staticmethod
     def get_legal_actions(state: GameState) -> list[int]:
-        return Actions.get_possible_actions(
-            state.get_pacman_state().configuration,
-            state.data.layout.walls,
-        )
+        configuration = state.get_pacman_state().configuration
+        position = configuration.get_position()
+        if isinstance(position, Point):
+            return list(state.data.action_table.get_pacman_actions(position))
+
+        return Actions.get_possible_actions(configuration, state.get_walls())
 
     @staticmethod
     def apply_action(state: GameState, action: int) -> None:
@@ -174,7 +195,7 @@ class PacmanRules:
         if action not in legal:
             raise Exception(f"Illegal action {action}")
 
-        pacman = state.get_pacman_state()
+        pacman = state.data.mutable_agent_state(0)
 
         vector = Actions.direction_to_vector(action, PACMAN_SPEED)
         pacman.configuration = pacman.configuration.generate_next(vector)
@@ -187,37 +208,40 @@ class PacmanRules:
 
     @staticmethod
     def consume(position: Vector, state: GameState) -> None:
-        x, y = position
-
-        if state.data.food[x][y]:
+        if state.data.food[position]:
             state.data.score_change += 10
-            state.data.food[x][y] = False
+            state.data.eat_food(position)
             state.data._food_eaten = position
 
             if state.get_num_food() == 0 and not state.is_lose():
                 state.data.score_change += 500
                 state.data._win = True
 
-        if position in state.get_capsules():
-            state.data.capsules.remove(position)
+        if position in state.data.capsules:
+            state.data.eat_capsule(position)
             state.data._capsule_eaten = position
 
             for idx in range(1, state.get_num_agents()):
-                state.data.agent_states[idx].scared_timer = SCARED_TIME
+                ghost = state.data.mutable_agent_state(idx)
+                ghost.scared_timer = SCARED_TIME
 
 
 class GhostRules:
     @staticmethod
     def get_legal_actions(state: GameState, ghost_idx: int) -> list[int]:
         configuration = state.get_ghost_state(ghost_idx).configuration
+        position = configuration.get_position()
+        if isinstance(position, Point):
+            actions = state.data.action_table.get_ghost_actions(
+                position, configuration.get_direction()
+            )
+            return list(actions)
 
         reverse = Actions.reverse_direction(configuration.get_direction())
         actions = list(
             filter(
                 lambda action: action != Direction.STOP,
-                Actions.get_possible_actions(
-                    configuration, state.data.layout.walls
-                ),
+                Actions.get_possible_actions(configuration, state.get_walls()),
             )
         )
         if reverse in actions and len(actions) > 1:
@@ -230,7 +254,7 @@ class GhostRules:
         if action not in legal:
             raise Exception(f"Illegal action {action}")
 
-        ghost = state.get_ghost_state(ghost_idx)
+        ghost = state.data.mutable_agent_state(ghost_idx)
         vector = Actions.direction_to_vector(
             action,
             GHOST_SPEED / 2 if ghost.scared_timer > 0 else GHOST_SPEED,
@@ -239,6 +263,14 @@ class GhostRules:
 
     @staticmethod
     def decrement_timer(ghost: AgentState) -> None:
+        # A ghost leaving the scared half speed must stand on a cell again,
+        # otherwise it keeps its direction through walls
+        if ghost.scared_timer == 1:
+            configuration = ghost.configuration
+            ghost.configuration = Configuration(
+                configuration.get_position().nearest(),
+                configuration.get_direction(),
+            )
         ghost.scared_timer = max(0, ghost.scared_timer - 1)
 
     @staticmethod
@@ -246,16 +278,16 @@ class GhostRules:
         pacman = state.get_pacman_position()
         if agent_idx == 0:
             for idx in range(1, state.get_num_agents()):
-                ghost_state = state.get_ghost_state(idx)
-                ghost = ghost_state.get_position()
+                ghost = state.get_ghost_position(idx)
 
                 if GhostRules.can_kill(pacman, ghost):
+                    ghost_state = state.data.mutable_agent_state(idx)
                     GhostRules.collide(state, ghost_state, idx)
         else:
-            ghost_state = state.get_ghost_state(agent_idx)
-            ghost = ghost_state.get_position()
+            ghost = state.get_ghost_position(agent_idx)
 
             if GhostRules.can_kill(pacman, ghost):
+                ghost_state = state.data.mutable_agent_state(agent_idx)
                 GhostRules.collide(state, ghost_state, agent_idx)
 
     @staticmethod
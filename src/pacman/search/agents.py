@@ -1,12 +1,23 @@
 from functools import partial
 from typing import Callable, Optional, Type, Any
 
-from .problems import SearchProblem, FourPointProblem, AllFoodProblem
-from .heuristics import four_point_heuristic, all_food_heuristic
-from .solvers import a_star
-from ..agent import Agent
+from .cost_fns import CostFn, UniformCostFn
+from .incremental import DStarLite
+from .problems import (
+    SearchProblem,
+    WaypointProblem,
+    FourPointProblem,
+    AllFoodProblem,
+)
+from .heuristics import four_point_heuristic, mst_food_heuristic
+from .solvers import a_star, held_karp
+from .states import SearchState
+from ..agent import Actions, Agent
 from ...consts.direction import Direction
+from ...consts.types import Action, Cost
 from ...utils.general import get_arg_names
+from ...utils.graph import NO_CELL, walls_to_csr
+from ...utils.vector import Point
 
 
 class SearchAgent(Agent):
@@ -48,11 +59,125 @@ class SearchAgent(Agent):
 
 class FourPointAgent(SearchAgent):
     def __init__(self) -> None:
-        self.search_fn = partial(a_star, heuristic=four_point_heuristic)
+        self.search_fn = partial(
+            a_star, heuristic=four_point_heuristic, tie_break=True
+        )
         self.problem_type = FourPointProblem
 
 
+class WaypointAgent(SearchAgent):
+    def __init__(self, **problem_kwargs: Any) -> None:
+        self.search_fn = held_karp
+        self.problem_type = WaypointProblem
+        self.problem_kwargs = problem_kwargs
+
+
 class AllFoodAgent(SearchAgent):
     def __init__(self) -> None:
-        self.search_fn = partial(a_star, heuristic=all_food_heuristic)
+        self.search_fn = partial(
+            a_star, heuristic=mst_food_heuristic, tie_break=True
+        )
         self.problem_type = AllFoodProblem
+
+
+class ReplanningAgent(Agent):
+    # Walks to the nearest food along a D* Lite plan that is repaired, not
+    # re-solved, when food is eaten or ghosts move
+    def __init__(
+        self,
+        index: int = 0,
+        cost_fn: Type[CostFn] = UniformCostFn,
+        ghost_cost: Cost = 50,
+        ghost_radius: int = 1,
+        max_expansions: Optional[int] = 1000,
+        **cost_kwargs: Any,
+    ) -> None:
+        super().__init__(index=index)
+        self.cost_fn = cost_fn
+        self.cost_kwargs = cost_kwargs
+        self.ghost_cost = ghost_cost
+        self.ghost_radius = ghost_radius
+        self.max_expansions = max_expansions
+
+    def register_state(self, game_state) -> None:
+        csgraph, self.cell_index = walls_to_csr(game_state.get_walls())
+        indptr, indices = csgraph.indptr.tolist(), csgraph.indices.tolist()
+        self.neighbors = [
+            indices[indptr[cell] : indptr[cell + 1]]
+            for cell in range(len(indptr) - 1)
+        ]
+        xs, ys = (self.cell_index != NO_CELL).nonzero()
+        self.positions = [
+            Point(x, y) for x, y in zip(xs.tolist(), ys.tolist())
+        ]
+
+        cost_fn = self.cost_fn(game_state, **self.cost_kwargs)
+        self.base_costs = [
+            cost_fn(SearchState(position)) for position in self.positions
+        ]
+        self.food = self.__get_food(game_state)
+        self.danger: set[int] = set()
+        self.planner = DStarLite(
+            self.neighbors,
+            self.positions,
+            self.base_costs,
+            self.food,
+            self.__get_cell(game_state.get_pacman_position()),
+            cost_fn.get_min_cost(),
+        )
+        # The first plan is unbounded, later moves only repair it
+        self.planner.compute()
+
+    def get_action(self, game_state) -> Action:
+        cell = self.__get_cell(game_state.get_pacman_position())
+        self.planner.move_start(cell)
+
+        food = self.__get_food(game_state)
+        for eaten in self.food - food:
+            self.planner.remove_goal(eaten)
+        self.food = food
+
+        danger = self.__get_danger(game_state)
+        for changed in self.danger ^ danger:
+            cost = self.base_costs[changed]
+            if changed in danger:
+                cost += self.ghost_cost
+            self.planner.set_cost(changed, cost)
+        self.danger = danger
+
+        self.planner.compute(self.max_expansions)
+        next_cell = self.planner.get_next(cell)
+        if next_cell is None:
+            return Direction.STOP
+        x, y = self.positions[cell]
+        next_x, next_y = self.positions[next_cell]
+        return Actions.vector_to_direction(Point(next_x - x, next_y - y))
+
+    def __get_cell(self, position) -> int:
+        return self.cell_index[position].item()
+
+    def __get_food(self, game_state) -> set[int]:
+        return {
+            self.__get_cell(position)
+            for position in game_state.get_food_sources()
+        }
+
+    def __get_danger(self, game_state) -> set[int]:
+        danger = set()
+        for idx in range(1, game_state.get_num_agents()):
+            ghost = game_state.get_ghost_state(idx)
+            if ghost.scared_timer > 0:
+                continue
+            frontier = {self.__get_cell(ghost.get_position().nearest())}
+            danger |= frontier
+            for _ in range(self.ghost_radius):
+                frontier = {
+                    neighbor
+                    for cell in frontier
+                    for neighbor in self.neighbors[cell]
+                } - danger
+                danger |= frontier
+        return danger
+
+    def get_algo(self) -> Optional[str]:
+        return "d* lite"
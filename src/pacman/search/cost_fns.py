@@ -12,6 +12,9 @@ class CostFn:
     def get_min_cost(self) -> Cost:
         raise NotImplementedError
 
+    def get_costs(self) -> list[Cost]:
+        raise NotImplementedError
+
     def __call__(self, state: SearchState) -> Cost:
         raise NotImplementedError
 
@@ -23,6 +26,9 @@ class UniformCostFn(CostFn):
     def get_min_cost(self) -> Cost:
         return self.cost
 
+    def get_costs(self) -> list[Cost]:
+        return [self.cost]
+
     def __call__(self, state: SearchState) -> Cost:
         return self.cost
 
@@ -38,6 +44,8 @@ class FoodCostFn(CostFn):
     def get_min_cost(self) -> Cost:
         return min(self.food_cost, self.empty_cost)
 
+    def get_costs(self) -> list[Cost]:
+        return [self.food_cost, self.empty_cost]
+
     def __call__(self, state: SearchState) -> Cost:
-        xx, yy = state.position
-        return self.food_cost if self.food[xx][yy] else self.empty_cost
+        return self.food_cost if self.food[state.position] else self.empty_cost
@@ -1,8 +1,5 @@
-import itertools
-
-from .states import FourPointState, AllFoodState, SearchState
-from .problems import FourPointProblem, AllFoodProblem, PositionProblem
-from ...utils.graph import get_maze_dists
+from .states import WaypointState, AllFoodState, SearchState
+from .problems import WaypointProblem, AllFoodProblem, PositionProblem
 
 
 def distance_heuristic(
@@ -17,42 +14,33 @@ def distance_heuristic(
     return problem.get_min_cost() * metric(goal)
 
 
-def four_point_heuristic(
-    state: FourPointState, problem: FourPointProblem
+def waypoint_heuristic(
+    state: WaypointState, problem: WaypointProblem
 ) -> float:
     if problem.is_goal(state):
         return 0
-    rest_points = [
-        point
-        for idx, point in enumerate(problem.get_points())
-        if 1 << idx & state.bit_mask == 0b0000
-    ]
-    paths = itertools.permutations(rest_points)
-    distances = [
-        sum(
-            problem.get_min_cost() * xx.manhattan(yy)
-            for xx, yy in zip([state.position, *path[:-1]], path)
-        )
-        for path in paths
-    ]
-    min_distance = min(distances)
-    return min_distance
+    return problem.get_min_cost() * problem.get_remaining_cost(
+        state.position, state.bit_mask
+    )
+
+
+four_point_heuristic = waypoint_heuristic
 
 
 def all_food_heuristic(state: AllFoodState, problem: AllFoodProblem) -> float:
     if problem.is_goal(state):
         return 0
-    memory = problem.history.get("memory")
-    if memory is None:
-        memory = get_maze_dists(
-            *problem.get_adjmatrix(), goals=problem.get_food()
-        )
-        problem.history["memory"] = memory
-    path_lens = [
-        problem.get_min_cost() * memory.get(state.position, goal)
-        for goal in list(state.rest)
-    ]
-    return min(path_lens)
+    memory = problem.get_maze_dists()
+    goals = problem.get_rest_cells(state.food_mask)
+    return problem.get_min_cost() * memory.min_to(state.cell, goals)
+
+
+def mst_food_heuristic(state: AllFoodState, problem: AllFoodProblem) -> float:
+    # Reach the nearest pellet, then at least a spanning tree of the rest
+    if problem.is_goal(state):
+        return 0
+    tree = problem.get_min_cost() * problem.get_tree_weight(state.food_mask)
+    return all_food_heuristic(state, problem) + tree
 
 
 def suboptimal_all_food_heuristic(
@@ -60,8 +48,9 @@ def suboptimal_all_food_heuristic(
 ) -> float:
     if problem.is_goal(state):
         return 0
-    metric = getattr(state.position, metric)
+    metric = getattr(problem.get_position(state.cell), metric)
     distances = [
-        problem.get_min_cost() * metric(goal) for goal in list(state.rest)
+        problem.get_min_cost() * metric(problem.get_position(goal))
+        for goal in problem.get_rest_cells(state.food_mask).tolist()
     ]
     return min(distances)
@@ -0,0 +1,135 @@
+from typing import Iterable, Optional
+
+from ...consts.game import INF_COST
+from ...consts.types import Cost, Position
+from ...utils.data_structures import PriorityQueue
+
+Key = tuple[Cost, Cost]
+
+
+class DStarLite:
+    # Searches backwards from every goal cell, so g of a cell is the cost of
+    # its cheapest path to any goal. Goals and cell costs may change between
+    # moves and only the cells they affect are repaired
+    def __init__(
+        self,
+        neighbors: list[list[int]],
+        positions: list[Position],
+        costs: list[Cost],
+        goals: Iterable[int],
+        start: int,
+        min_cost: Cost = 1,
+    ) -> None:
+        self.neighbors = neighbors
+        self.positions = positions
+        self.costs = list(costs)
+        self.min_cost = min_cost
+        self.g = [INF_COST] * len(neighbors)
+        self.rhs = [INF_COST] * len(neighbors)
+        self.goals = set(goals)
+        self.start = start
+        self.km = 0
+        self.queue = PriorityQueue()
+        # Current key of every queued cell, other heap entries are stale
+        self.keys: dict[int, Key] = {}
+        self.expansions = 0
+
+        for goal in self.goals:
+            self.rhs[goal] = 0
+            self.__push(goal)
+
+    def move_start(self, start: int) -> None:
+        self.km += self.__heuristic(start)
+        self.start = start
+
+    def set_cost(self, cell: int, cost: Cost) -> None:
+        if self.costs[cell] == cost:
+            return
+        # Entering the cell got cheaper or dearer for all its neighbors
+        self.costs[cell] = cost
+        for neighbor in self.neighbors[cell]:
+            self.__update(neighbor)
+
+    def remove_goal(self, cell: int) -> None:
+        if cell in self.goals:
+            self.goals.remove(cell)
+            self.__update(cell)
+
+    def compute(self, max_expansions: Optional[int] = None) -> bool:
+        # Returns False when the expansion budget ran out before the start
+        # became consistent; the queue keeps the rest for the next call
+        expansions = 0
+        while not self.queue.is_empty():
+            cell, key = self.queue.pop()
+            if self.keys.get(cell) != key:
+                continue
+            if not self.__is_open(key):
+                self.queue.push(cell, key)
+                return True
+            if max_expansions is not None and expansions >= max_expansions:
+                self.queue.push(cell, key)
+                return False
+
+            new_key = self.__get_key(cell)
+            if key < new_key:
+                self.__push(cell, new_key)
+                continue
+
+            expansions += 1
+            self.expansions += 1
+            del self.keys[cell]
+            if self.g[cell] > self.rhs[cell]:
+                self.g[cell] = self.rhs[cell]
+                for neighbor in self.neighbors[cell]:
+                    self.__update(neighbor)
+            else:
+                self.g[cell] = INF_COST
+                self.__update(cell)
+                for neighbor in self.neighbors[cell]:
+                    self.__update(neighbor)
+        return True
+
+    def get_next(self, cell: int) -> Optional[int]:
+        best, best_cost = None, INF_COST
+        for neighbor in self.neighbors[cell]:
+            cost = self.costs[neighbor] + self.g[neighbor]
+            if cost < best_cost:
+                best, best_cost = neighbor, cost
+        return best
+
+    def get_cost(self, cell: int) -> Cost:
+        # The start may stay overconsistent, its rhs is already exact
+        return self.rhs[cell]
+
+    def __is_open(self, key: Key) -> bool:
+        start = self.start
+        return key < self.__get_key(start) or self.rhs[start] > self.g[start]
+
+    def __update(self, cell: int) -> None:
+        if cell not in self.goals:
+            self.rhs[cell] = min(
+                (
+                    self.costs[neighbor] + self.g[neighbor]
+                    for neighbor in self.neighbors[cell]
+                ),
+                default=INF_COST,
+            )
+        if self.g[cell] != self.rhs[cell]:
+            self.__push(cell)
+        else:
+            self.keys.pop(cell, None)
+
+    def __push(self, cell: int, key: Optional[Key] = None) -> None:
+        if key is None:
+            key = self.__get_key(cell)
+        self.keys[cell] = key
+        self.queue.push(cell, key)
+
+    def __get_key(self, cell: int) -> Key:
+        cost = min(self.g[cell], self.rhs[cell])
+        return cost + self.__heuristic(cell) + self.km, cost
+
+    def __heuristic(self, cell: int) -> Cost:
+        x, y = self.positions[cell]
+        start_x, start_y = self.positions[self.start]
+        return self.min_cost * (abs(x - start_x) + abs(y - start_y))
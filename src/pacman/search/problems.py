@@ -1,22 +1,22 @@
-from collections import defaultdict
+import numpy as np
 from typing import Optional, Type, Any
 
-from .states import SearchState, FourPointState, AllFoodState
+from .states import SearchState, WaypointState, FourPointState, AllFoodState
 from .cost_fns import CostFn, UniformCostFn
 from ..agent import Actions
 from ...consts.direction import Direction
-from ...consts.types import (
-    AdjList,
-    AdjMatrix,
-    PosToIdx,
-    Position,
-    Cost,
-    Action,
-)
-from ...utils.graph import adjlist_to_adjmatrix
-from ...utils.data_structures import Queue
+from ...consts.game import INF_COST
+from ...consts.types import Position, Cost, Action
+from ...utils.data_structures import LRUCache, MazeDistance
+from ...utils.graph import get_path_costs, get_tree_weight
 
 Neighbor = tuple[SearchState, Action, Cost]
+# Remaining-food lookups kept per problem before the cache is reset
+MAX_CACHED_MASKS = 65536
+MAX_CACHED_TREES = 65536
+MAX_CACHED_COSTS = 2 ** 20
+# Held-Karp tables have 2^K * K entries
+MAX_WAYPOINTS = 20
 
 
 class SearchProblem:
@@ -28,6 +28,7 @@ class SearchProblem:
     ) -> None:
         self.history = {}
         self.walls = game_state.get_walls()
+        self.layout = game_state.get_layout()
         self.cost_fn = cost_fn(game_state, **cost_kwargs)
 
     def get_neighbor(
@@ -41,9 +42,8 @@ class SearchProblem:
             move = Actions.direction_to_vector(action)
 
             position = (state.position + move).as_int()
-            xx, yy = position
 
-            if not self.walls[xx][yy]:
+            if not self.walls[position]:
                 neighbor = self.get_neighbor(state, position, action)
                 neighbors.append(neighbor)
 
@@ -55,31 +55,15 @@ class SearchProblem:
     def get_start(self) -> Position:
         raise NotImplementedError
 
-    def get_adjlist(self) -> AdjList:
-        adjlist = defaultdict(list)
-        start = self.get_start()
-        visited = set()
-        queue = Queue()
-        queue.push(start)
-
-        while not queue.is_empty():
-            parent = queue.pop()
-            visited.add(parent.position)
-
-            for state, _, cost in self.get_neighbors(parent):
-                if state.position not in visited:
-                    queue.push(state)
-                adjlist[parent.position].append((state.position, cost))
-
-        return adjlist
-
-    def get_adjmatrix(self) -> tuple[AdjMatrix, PosToIdx]:
-        adjlist = self.get_adjlist()
-        return adjlist_to_adjmatrix(adjlist)
+    def get_maze_dists(self) -> MazeDistance:
+        return self.layout.get_maze_dists()
 
     def get_min_cost(self) -> Cost:
         return self.cost_fn.get_min_cost()
 
+    def get_costs(self) -> list[Cost]:
+        return self.cost_fn.get_costs()
+
 
 class PositionProblem(SearchProblem):
     def __init__(
@@ -113,7 +97,9 @@ class PositionProblem(SearchProblem):
         return self.goal
 
 
-class FourPointProblem(SearchProblem):
+class WaypointProblem(SearchProblem):
+    state_type = WaypointState
+
     def __init__(
         self,
         game_state,
@@ -122,30 +108,46 @@ class FourPointProblem(SearchProblem):
         **cost_kwargs: Any,
     ) -> None:
         super().__init__(game_state, cost_fn, **cost_kwargs)
-        self.start = FourPointState(
-            game_state.get_pacman_position(),
-        )
+        self.game_state = game_state
+        self.cost_type = cost_fn
+        self.cost_kwargs = cost_kwargs
         if points is None:
             self.points = game_state.get_food_sources()
         else:
             self.points = points
-        assert len(self.points) == 4, "Invalid number of food sources"
+        # Masks of visited points index tables of size 2 ** len(points)
+        if not 0 < len(self.points) <= MAX_WAYPOINTS:
+            raise ValueError(
+                f"Waypoint search needs 1 to {MAX_WAYPOINTS} points, got "
+                f"{len(self.points)}, pass points explicitly"
+            )
+        self.point_bits = {
+            point: 1 << idx for idx, point in enumerate(self.points)
+        }
+        self.full_mask = (1 << len(self.points)) - 1
+        self.start = self.state_type(game_state.get_pacman_position())
+
+        self.maze_dists = self.get_maze_dists()
+        self.point_cells = self.maze_dists.get_cells(self.points)
+        self.point_dists = np.array(
+            [self.__get_dists(cell) for cell in self.point_cells.tolist()]
+        )
+        self.path_costs: Optional[np.ndarray] = None
+        self.path_parents: Optional[np.ndarray] = None
+        self.remaining_costs: dict[tuple[int, int], Cost] = {}
+        self.legs: dict[tuple[Position, Position], list[Action]] = {}
 
-    def get_start(self) -> FourPointState:
+    def get_start(self) -> WaypointState:
         return self.start
 
-    def is_goal(self, state: FourPointState) -> bool:
-        return state.bit_mask == 0b1111
+    def is_goal(self, state: WaypointState) -> bool:
+        return state.bit_mask == self.full_mask
 
     def get_neighbor(
-        self, state: FourPointState, position: Position, action: Action
+        self, state: WaypointState, position: Position, action: Action
     ) -> Neighbor:
-        if position in self.points:
-            point_mask = 1 << self.points.index(position)
-            bit_mask = point_mask | state.bit_mask
-        else:
-            bit_mask = state.bit_mask
-        next_state = FourPointState(position, bit_mask)
+        bit_mask = state.bit_mask | self.point_bits.get(position, 0)
+        next_state = self.state_type(position, bit_mask)
 
         cost = self.cost_fn(next_state)
         return next_state, action, cost
@@ -153,6 +155,76 @@ class FourPointProblem(SearchProblem):
     def get_points(self) -> list[Position]:
         return self.points
 
+    def get_path_costs(self) -> tuple[np.ndarray, np.ndarray]:
+        if self.path_costs is None:
+            self.path_costs, self.path_parents = get_path_costs(
+                self.point_dists
+            )
+        return self.path_costs, self.path_parents
+
+    def get_remaining_cost(self, position: Position, bit_mask: int) -> Cost:
+        # Maze distance of the shortest walk from the position through all
+        # points left in the mask
+        cell = self.maze_dists.get_cell(position)
+        key = (cell, bit_mask)
+        cost = self.remaining_costs.get(key)
+        if cost is None:
+            rest = self.full_mask ^ bit_mask
+            cost = 0
+            if rest != 0:
+                costs, _ = self.get_path_costs()
+                cost = (self.__get_dists(cell) + costs[rest]).min().item()
+                cost = int(cost) if cost != INF_COST else cost
+            if len(self.remaining_costs) >= MAX_CACHED_COSTS:
+                self.remaining_costs.clear()
+            self.remaining_costs[key] = cost
+        return cost
+
+    def get_order(self, position: Position, bit_mask: int = 0) -> list[int]:
+        # Indices of the points left in the mask along the shortest walk
+        rest = self.full_mask ^ bit_mask
+        if rest == 0:
+            return []
+        costs, parents = self.get_path_costs()
+        dists = self.__get_dists(self.maze_dists.get_cell(position))
+        point = (dists + costs[rest]).argmin().item()
+        order = []
+        while point >= 0:
+            order.append(point)
+            rest, point = rest ^ 1 << point, parents[rest, point].item()
+        return order
+
+    def get_leg_problem(
+        self, start: Position, end: Position
+    ) -> PositionProblem:
+        return PositionProblem(
+            self.game_state, end, start, self.cost_type, **self.cost_kwargs
+        )
+
+    def __get_dists(self, cell: int) -> np.ndarray:
+        dists = self.maze_dists.get_many(cell, self.point_cells)
+        costs = dists.astype(float)
+        if self.maze_dists.unreachable is not None:
+            costs[dists == self.maze_dists.unreachable] = INF_COST
+        return costs
+
+
+class FourPointProblem(WaypointProblem):
+    state_type = FourPointState
+
+    def __init__(
+        self,
+        game_state,
+        points: Optional[list[Position]] = None,
+        cost_fn: Type[CostFn] = UniformCostFn,
+        **cost_kwargs: Any,
+    ) -> None:
+        super().__init__(game_state, points, cost_fn, **cost_kwargs)
+        if len(self.points) != 4:
+            raise ValueError(
+                f"Four point search needs 4 points, got {len(self.points)}"
+            )
+
 
 class AllFoodProblem(SearchProblem):
     def __init__(
@@ -163,27 +235,97 @@ class AllFoodProblem(SearchProblem):
     ) -> None:
         super().__init__(game_state, cost_fn, **cost_kwargs)
         self.food = game_state.get_food_sources()
+        self.maze_dists = self.get_maze_dists()
+        self.food_cells = self.maze_dists.get_cells(self.food)
+        self.food_bits = {
+            cell: 1 << idx for idx, cell in enumerate(self.food_cells.tolist())
+        }
+        self.moves: dict[int, list[tuple[int, int, Action, Cost]]] = {}
+        self.rest_cells: dict[int, np.ndarray] = {}
+        self.food_dists: Optional[np.ndarray] = None
+        self.tree_weights = LRUCache(MAX_CACHED_TREES)
         self.start = AllFoodState(
-            game_state.get_pacman_position(), frozenset(self.food)
+            self.maze_dists.get_cell(game_state.get_pacman_position()),
+            (1 << len(self.food)) - 1,
         )
 
     def get_start(self) -> AllFoodState:
         return self.start
 
     def is_goal(self, state: AllFoodState) -> bool:
-        return len(state.rest) == 0
-
-    def get_neighbor(
-        self, state: AllFoodState, position: Position, action: Action
-    ) -> Neighbor:
-        rest = (
-            state.rest - set([position])
-            if position in state.rest
-            else state.rest
-        )
-        next_state = AllFoodState(position, rest)
-        cost = self.cost_fn(next_state)
-        return next_state, action, cost
+        return state.food_mask == 0
+
+    def get_neighbors(self, state: AllFoodState) -> list[Neighbor]:
+        moves = self.moves.get(state.cell)
+        if moves is None:
+            moves = self.moves[state.cell] = self.__get_moves(state.cell)
+        food_mask = state.food_mask
+        return [
+            (AllFoodState(cell, food_mask & ~bit), action, cost)
+            for cell, bit, action, cost in moves
+        ]
+
+    def get_position(self, cell: int) -> Position:
+        return self.maze_dists.get_position(cell)
+
+    def get_rest_cells(self, food_mask: int) -> np.ndarray:
+        cells = self.rest_cells.get(food_mask)
+        if cells is None:
+            bits = [
+                idx for idx in range(len(self.food)) if food_mask >> idx & 1
+            ]
+            cells = self.food_cells[bits]
+            if len(self.rest_cells) >= MAX_CACHED_MASKS:
+                self.rest_cells.clear()
+            self.rest_cells[food_mask] = cells
+        return cells
 
     def get_food(self) -> list[Position]:
         return self.food
+
+    def get_food_dists(self) -> np.ndarray:
+        if self.food_dists is None:
+            cells = self.food_cells
+            dists = np.array(
+                [self.maze_dists.get_many(cell, cells) for cell in cells],
+                dtype=float,
+            ).reshape(len(cells), len(cells))
+            if self.maze_dists.unreachable is not None:
+                dists[dists == self.maze_dists.unreachable] = INF_COST
+            self.food_dists = dists
+        return self.food_dists
+
+    def get_tree_weight(self, food_mask: int) -> Cost:
+        # Spanning tree weight of the remaining food, most masks recur many
+        # times as pacman walks between the same pellets
+        return self.tree_weights.get(
+            food_mask, lambda: self.__build_tree_weight(food_mask)
+        )
+
+    def __build_tree_weight(self, food_mask: int) -> Cost:
+        bits = [idx for idx in range(len(self.food)) if food_mask >> idx & 1]
+        dists = self.get_food_dists()
+        weight = get_tree_weight(dists[np.ix_(bits, bits)])
+        if weight != INF_COST:
+            weight = int(weight)
+        return weight
+
+    def __get_moves(self, cell: int) -> list[tuple[int, int, Action, Cost]]:
+        # Cost functions only look at the position, so moves out of a cell
+        # are the same for every food mask
+        moves = []
+        position = self.get_position(cell)
+        for next_state, action, cost in super().get_neighbors(
+            SearchState(position)
+        ):
+            next_cell = self.maze_dists.get_cell(next_state.position)
+            moves.append(
+                (next_cell, self.food_bits.get(next_cell, 0), action, cost)
+            )
+        return moves
+
+    def get_neighbor(
+        self, state: SearchState, position: Position, action: Action
+    ) -> Neighbor:
+        next_state = SearchState(position)
+        return next_state, action, self.cost_fn(next_state)
@@ -1,109 +1,355 @@
-from typing import Callable
+from typing import Callable, Optional, Type, Union
 
-from .problems import SearchProblem
+from .cost_fns import UniformCostFn
+from .heuristics import distance_heuristic
+from .problems import PositionProblem, SearchProblem, WaypointProblem
+from ..agent import Actions
 from ...consts.game import INF_COST
-from ...consts.types import Action
-from ...utils.data_structures import Stack, Queue, PriorityQueue
+from ...consts.types import Action, Position
+from ...utils.data_structures import (
+    BucketQueue,
+    HeapFrontier,
+    NodeArena,
+    Queue,
+    Stack,
+)
+from ...utils.graph import NO_CELL, NeighborTable
 from ...utils.timer import time_it
 
+Frontier = Union[HeapFrontier, BucketQueue]
+# Cell -> (cell it was reached from, action between them)
+Links = dict[int, Optional[tuple[int, Action]]]
+Cell = tuple[int, int]
+
+
+def reset_arena(arena: Optional[NodeArena]) -> NodeArena:
+    # Callers that search often pass their own arena to reuse its storage
+    if arena is None:
+        return NodeArena()
+    arena.clear()
+    return arena
+
 
 @time_it()
-def bfs(problem: SearchProblem) -> list[Action]:
+def bfs(
+    problem: SearchProblem, arena: Optional[NodeArena] = None
+) -> list[Action]:
     # For cost = const
+    arena = reset_arena(arena)
     start = problem.get_start()
-    visited = set()
+    visited = {start}
     queue = Queue()
-    queue.push((start, []))
+    queue.push(arena.add(start, NodeArena.ROOT, None))
 
     while not queue.is_empty():
-        parent, actions = queue.pop()
-        visited.add(parent)
+        node = queue.pop()
+        parent = arena.states[node]
         if problem.is_goal(parent):
-            return actions
+            return arena.get_path(node)
         for state, action, _ in problem.get_neighbors(parent):
             if state in visited:
                 continue
-            new_actions = actions + [action]
-            queue.push((state, new_actions))
+            visited.add(state)
+            queue.push(arena.add(state, node, action))
 
     return []
 
 
 @time_it()
-def dfs(problem: SearchProblem) -> list[Action]:
+def dfs(
+    problem: SearchProblem, arena: Optional[NodeArena] = None
+) -> list[Action]:
     # Not optimal path
+    arena = reset_arena(arena)
     start = problem.get_start()
     visited = set()
     stack = Stack()
-    stack.push(start)
+    stack.push(arena.add(start, NodeArena.ROOT, None))
 
     while not stack.is_empty():
-        parent, actions = stack.pop()
+        node = stack.pop()
+        parent = arena.states[node]
+        if parent in visited:
+            continue
         visited.add(parent)
         if problem.is_goal(parent):
-            return actions
+            return arena.get_path(node)
         for state, action, _ in problem.get_neighbors(parent):
             if state in visited:
                 continue
-            new_actions = actions + [action]
-            stack.push((state, new_actions))
+            stack.push(arena.add(state, node, action))
 
     return []
 
 
-@time_it(True)
-def ucs(problem: SearchProblem) -> list[list[Action]]:
+def best_first(
+    problem: SearchProblem,
+    heuristic: Optional[Callable],
+    greedy: bool,
+    arena: Optional[NodeArena],
+    frontier_type: Type[Frontier] = HeapFrontier,
+    tie_break: bool = False,
+) -> list[Action]:
+    arena = reset_arena(arena)
     start = problem.get_start()
-    costs = {start: 0}
-    visited = set()
-    queue = PriorityQueue()
-    queue.push((start, []), 0)
+    # The node holding the cheapest known path of every generated state
+    best = {start: arena.add(start, NodeArena.ROOT, None)}
+    frontier = frontier_type(tie_break)
+    frontier.push(start, best[start], 0)
 
-    while not queue.is_empty():
-        (parent, actions), cost = queue.pop()
-        visited.add(parent)
-        if costs[parent] < cost:
-            continue
+    while not frontier.is_empty():
+        node, _ = frontier.pop()
+        parent = arena.states[node]
+        arena.closed[node] = True
         if problem.is_goal(parent):
-            return actions
+            return arena.get_path(node)
+        cost = arena.costs[node]
         for state, action, move_cost in problem.get_neighbors(parent):
-            if state in visited:
-                continue
             new_cost = cost + move_cost
-            if new_cost < costs.get(state, INF_COST):
-                new_actions = actions + [action]
-                costs[state] = new_cost
-                queue.push((state, new_actions), new_cost)
+            seen = best.get(state)
+            if seen is not None and (
+                arena.closed[seen] or new_cost >= arena.costs[seen]
+            ):
+                continue
+            estimate = 0 if heuristic is None else heuristic(state, problem)
+            # No goal is reachable from states an admissible heuristic
+            # rates infinite
+            if estimate == INF_COST:
+                continue
+            priority = estimate if greedy else new_cost + estimate
+            child = best[state] = arena.add(state, node, action, new_cost)
+            frontier.push(state, child, priority, estimate)
 
     return []
 
 
+@time_it(True)
+def ucs(
+    problem: SearchProblem, arena: Optional[NodeArena] = None
+) -> list[Action]:
+    return best_first(problem, None, False, arena)
+
+
 @time_it()
 def a_star(
-    problem: SearchProblem, heuristic: Callable, greedy: bool = False
+    problem: SearchProblem,
+    heuristic: Callable,
+    greedy: bool = False,
+    arena: Optional[NodeArena] = None,
+    frontier_type: Type[Frontier] = HeapFrontier,
+    tie_break: bool = False,
 ) -> list[Action]:
+    if frontier_type is BucketQueue:
+        check_integral(problem, heuristic)
+    return best_first(
+        problem, heuristic, greedy, arena, frontier_type, tie_break
+    )
+
+
+def check_integral(problem: SearchProblem, heuristic: Callable) -> None:
+    # Bucket indices are priorities, so move costs and estimates must be
+    # whole numbers
     start = problem.get_start()
-    costs = {start: 0}
-    visited = set()
-    queue = PriorityQueue()
-    queue.push((start, []), 0)
+    values = [*problem.get_costs(), heuristic(start, problem)]
+    for value in values:
+        if value != INF_COST and not float(value).is_integer():
+            raise ValueError(
+                f"BucketQueue needs integer costs and heuristics, got {value}"
+                ", use HeapFrontier instead"
+            )
 
-    while not queue.is_empty():
-        (parent, actions), _ = queue.pop()
-        visited.add(parent)
-        cost = costs[parent]
-        if problem.is_goal(parent):
-            return actions
-        for state, action, move_cost in problem.get_neighbors(parent):
-            if state in visited:
+
+@time_it()
+def held_karp(
+    problem: WaypointProblem, arena: Optional[NodeArena] = None
+) -> list[Action]:
+    # Orders the waypoints by dynamic programming over maze distances and
+    # joins them with single-pair searches instead of searching the masks
+    start = problem.get_start()
+    position = start.position
+    points = problem.get_points()
+    actions = []
+    for idx in problem.get_order(position, start.bit_mask):
+        actions += get_leg(problem, position, points[idx], arena)
+        position = points[idx]
+    return actions
+
+
+def get_leg(
+    problem: WaypointProblem,
+    start: Position,
+    end: Position,
+    arena: Optional[NodeArena] = None,
+) -> list[Action]:
+    key = (start, end)
+    leg = problem.legs.get(key)
+    if leg is None:
+        leg = problem.legs[key] = a_star(
+            problem.get_leg_problem(start, end),
+            heuristic=distance_heuristic,
+            arena=arena,
+        )
+    return leg
+
+
+def is_grid_problem(problem: PositionProblem) -> bool:
+    # Unit moves between whole cells; scared ghosts may start between cells
+    return (
+        isinstance(problem.cost_fn, UniformCostFn)
+        and problem.get_start().position.is_int()
+    )
+
+
+@time_it()
+def bidirectional_bfs(problem: PositionProblem) -> list[Action]:
+    if not is_grid_problem(problem):
+        return a_star(problem, heuristic=distance_heuristic)
+    table = problem.layout.get_neighbor_table()
+    source = table.get_cell(problem.get_start().position.as_int())
+    target = table.get_cell(problem.get_goal())
+    if source == NO_CELL or target == NO_CELL:
+        return []
+
+    forward: Links = {source: None}
+    backward: Links = {target: None}
+    forward_layer, backward_layer = [source], [target]
+    meet = source if source == target else None
+    # Growing the smaller layer first keeps both searches near their radius
+    while meet is None and forward_layer and backward_layer:
+        if len(forward_layer) <= len(backward_layer):
+            forward_layer, meet = expand_layer(
+                table, forward_layer, forward, backward, False
+            )
+        else:
+            backward_layer, meet = expand_layer(
+                table, backward_layer, backward, forward, True
+            )
+    if meet is None:
+        return []
+
+    actions = follow_links(forward, meet)
+    actions.reverse()
+    return actions + follow_links(backward, meet)
+
+
+def expand_layer(
+    table: NeighborTable,
+    layer: list[int],
+    links: Links,
+    other: Links,
+    backward: bool,
+) -> tuple[list[int], Optional[int]]:
+    # With unit costs the first cell both searches reach lies on a
+    # shortest path, so the layer can stop there
+    next_layer = []
+    for cell in layer:
+        for action, neighbor in table.moves[cell]:
+            if neighbor in links:
                 continue
-            new_cost = cost + move_cost
-            if new_cost < costs.get(state, INF_COST):
-                new_actions = actions + [action]
-                priority = heuristic(state, problem)
-                if not greedy:
-                    priority += new_cost
-                costs[state] = new_cost
-                queue.push((state, new_actions), priority)
+            links[neighbor] = (cell, -action if backward else action)
+            if neighbor in other:
+                return next_layer, neighbor
+            next_layer.append(neighbor)
+    return next_layer, None
 
+
+def follow_links(links: Links, cell: int) -> list[Action]:
+    actions = []
+    while links[cell] is not None:
+        cell, action = links[cell]
+        actions.append(action)
+    return actions
+
+
+@time_it()
+def jump_point_search(problem: PositionProblem) -> list[Action]:
+    # Jump point search for 4-connected grids: straight runs without
+    # forced neighbors are skipped instead of expanded cell by cell
+    if not is_grid_problem(problem):
+        return a_star(problem, heuristic=distance_heuristic)
+    free = problem.layout.get_neighbor_table().free
+    start = tuple(problem.get_start().position.as_int())
+    goal = tuple(problem.get_goal())
+    if not (free[start[0]][start[1]] and free[goal[0]][goal[1]]):
+        return []
+
+    costs = {start: 0}
+    parents: dict[Cell, Optional[Cell]] = {start: None}
+    closed = set()
+    frontier = HeapFrontier()
+    frontier.push(start, start, 0)
+    while not frontier.is_empty():
+        node, _ = frontier.pop()
+        if node == goal:
+            return get_jump_path(parents, goal)
+        closed.add(node)
+        x, y = node
+        for dx, dy in get_jump_directions(free, node, parents[node]):
+            jump = get_jump_point(free, x, y, dx, dy, goal)
+            if jump is None or jump in closed:
+                continue
+            cost = costs[node] + abs(jump[0] - x) + abs(jump[1] - y)
+            if cost >= costs.get(jump, INF_COST):
+                continue
+            costs[jump], parents[jump] = cost, node
+            estimate = abs(goal[0] - jump[0]) + abs(goal[1] - jump[1])
+            frontier.push(jump, jump, cost + estimate)
     return []
+
+
+def get_jump_directions(
+    free: list[list[bool]], node: Cell, parent: Optional[Cell]
+) -> list[Cell]:
+    x, y = node
+    if parent is None:
+        directions = [(-1, 0), (0, -1), (0, 1), (1, 0)]
+    elif parent[1] == y:
+        # Horizontal runs turn only where they pass an opening
+        dx = 1 if x > parent[0] else -1
+        directions = [(dx, 0), (0, -1), (0, 1)]
+    else:
+        # Vertical runs already scanned both rows beside them
+        dy = 1 if y > parent[1] else -1
+        directions = [(0, dy), (-1, 0), (1, 0)]
+    return [(dx, dy) for dx, dy in directions if free[x + dx][y + dy]]
+
+
+def get_jump_point(
+    free: list[list[bool]], x: int, y: int, dx: int, dy: int, goal: Cell
+) -> Optional[Cell]:
+    while True:
+        x, y = x + dx, y + dy
+        if not free[x][y]:
+            return None
+        if (x, y) == goal:
+            return x, y
+        if dx != 0:
+            if (free[x][y - 1] and not free[x - dx][y - 1]) or (
+                free[x][y + 1] and not free[x - dx][y + 1]
+            ):
+                return x, y
+            continue
+        if (free[x - 1][y] and not free[x - 1][y - dy]) or (
+            free[x + 1][y] and not free[x + 1][y - dy]
+        ):
+            return x, y
+        if (
+            get_jump_point(free, x, y, 1, 0, goal) is not None
+            or get_jump_point(free, x, y, -1, 0, goal) is not None
+        ):
+            return x, y
+
+
+def get_jump_path(
+    parents: dict[Cell, Optional[Cell]], goal: Cell
+) -> list[Action]:
+    actions, node = [], goal
+    while parents[node] is not None:
+        parent = parents[node]
+        dx, dy = node[0] - parent[0], node[1] - parent[1]
+        steps = abs(dx) + abs(dy)
+        action = Actions.vector_to_direction((dx, dy))
+        actions.extend([action] * steps)
+        node = parent
+    actions.reverse()
+    return actions
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import NamedTuple
 
 from ...consts.types import Position
 
@@ -12,16 +13,20 @@ class SearchState:
 
 
 @dataclass(unsafe_hash=True, frozen=True)
-class FourPointState(SearchState):
+class WaypointState(SearchState):
+    bit_mask: int = 0
+
+
+@dataclass(unsafe_hash=True, frozen=True)
+class FourPointState(WaypointState):
     bit_mask: int = 0b0000
 
     def __lt__(self, other: "FourPointState") -> bool:
         return self.bit_mask > other.bit_mask
 
 
-@dataclass(unsafe_hash=True, frozen=True)
-class AllFoodState(SearchState):
-    rest: frozenset[Position]
-
-    def __lt__(self, other: "AllFoodState") -> bool:
-        return len(self.rest) < len(other.rest)
+class AllFoodState(NamedTuple):
+    # A plain tuple hashes and compares in C; bit i of the mask is set while
+    # the i-th food of the problem is left
+    cell: int
+    food_mask: int
@@ -0,0 +1,167 @@
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .agent import Agent
+from .rules import GameRules
+from .ghost_agents import GreedyGhost, RandomGhost
+from .multiagent.agents import ReflexAgent, MinimaxAgent, ExpectimaxAgent
+from .multiagent.mcts import MCTSAgent
+from .search.agents import (
+    FourPointAgent,
+    WaypointAgent,
+    AllFoodAgent,
+    ReplanningAgent,
+)
+from ..graphics.null_display import NullDisplay
+from ..consts.types import GameResult
+from ..utils.layout import Layout
+from ..utils.logger import Logger
+from ..utils.timer import Timer
+
+PACMAN_AGENTS = {
+    "minimax": MinimaxAgent,
+    "expectimax": ExpectimaxAgent,
+    "mcts": MCTSAgent,
+    "four_point": FourPointAgent,
+    "waypoint": WaypointAgent,
+    "all_food": AllFoodAgent,
+    "replanning": ReplanningAgent,
+}
+GHOST_AGENTS = {
+    "greedy": GreedyGhost,
+    "random": RandomGhost,
+}
+GENERATED_LAYOUT = "random"
+MAX_SEED = 2 ** 32
+
+
+@dataclass(eq=False)
+class Match:
+    idx: int
+    seed: int
+    agent: str
+    layout: str
+    num_ghosts: int
+    ghost: str = "greedy"
+    width: int = 32
+    height: int = 32
+    num_food: int = 10
+    maze_cache: Optional[str] = None
+    move_time: Optional[float] = None
+    move_nodes: Optional[int] = None
+    search_workers: int = 1
+
+
+def get_matches(
+    agents: list[str],
+    layouts: list[str],
+    ghost_counts: list[int],
+    num_games: int,
+    seed: Optional[int] = None,
+    **match_kwargs,
+) -> list[Match]:
+    rng = random.Random(seed)
+    sweep = product(agents, layouts, ghost_counts, range(num_games))
+    return [
+        Match(
+            idx=idx,
+            seed=rng.randrange(MAX_SEED),
+            agent=agent,
+            layout=layout,
+            num_ghosts=num_ghosts,
+            **match_kwargs,
+        )
+        for idx, (agent, layout, num_ghosts, _) in enumerate(sweep)
+    ]
+
+
+def build_layout(match: Match) -> Layout:
+    if match.layout == GENERATED_LAYOUT:
+        return Layout.generate(
+            height=match.height,
+            width=match.width,
+            num_food=match.num_food,
+            num_ghosts=match.num_ghosts,
+        )
+    layout = Layout.from_text(match.layout)
+    layout.num_ghosts = min(layout.num_ghosts, match.num_ghosts)
+    return layout
+
+
+def build_agent(match: Match) -> Agent:
+    agent_type = PACMAN_AGENTS[match.agent]
+    if issubclass(agent_type, ReflexAgent):
+        return agent_type(
+            move_time=match.move_time,
+            move_nodes=match.move_nodes,
+            num_workers=match.search_workers,
+        )
+    if issubclass(agent_type, MCTSAgent):
+        return agent_type(
+            move_time=match.move_time,
+            num_simulations=match.move_nodes,
+            num_workers=match.search_workers,
+        )
+    return agent_type()
+
+
+def play_match(match: Match) -> GameResult:
+    random.seed(match.seed)
+    np.random.seed(match.seed)
+
+    layout = build_layout(match)
+    if match.maze_cache is not None:
+        layout.get_maze_dists(match.maze_cache)
+    ghost_type = GHOST_AGENTS[match.ghost]
+    game = GameRules().new_game(
+        layout=layout,
+        pacman_agent=build_agent(match),
+        ghost_agents=[ghost_type(idx + 1) for idx in range(match.num_ghosts)],
+        display=NullDisplay(),
+        log_path=None,
+    )
+    result = game.run()
+    result.update(
+        match=match.idx,
+        seed=match.seed,
+        agent=match.agent,
+        layout=match.layout,
+        num_ghosts=match.num_ghosts,
+    )
+    return result
+
+
+def run_matches(
+    matches: list[Match], num_workers: int = 1
+) -> Iterator[GameResult]:
+    if num_workers <= 1:
+        yield from map(play_match, matches)
+        return
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        yield from executor.map(play_match, matches)
+
+
+def run_tournament(
+    matches: list[Match], log_path: Path, num_workers: int = 1
+) -> list[GameResult]:
+    logger = Logger(log_path)
+    timer = Timer()
+
+    timer.start()
+    results = []
+    for result in run_matches(matches, num_workers):
+        logger.log_result(result)
+        results.append(result)
+    timer.stop()
+
+    num_games = len(results)
+    print(
+        f"Played {num_games} games on {num_workers} workers",
+        f"in {timer.elapsed:.2f}s ({num_games / timer.elapsed:.2f} games/s)",
+    )
+    return results
@@ -0,0 +1,151 @@
+import numpy as np
+from functools import lru_cache
+from typing import Iterator, Union
+
+from .grid import Grid, Walls
+from ..consts.types import Position
+
+
+def popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+@lru_cache(maxsize=None)
+def get_cell_indices(width: int, height: int) -> dict[Position, int]:
+    return {
+        Position(x, y): x * height + y
+        for x in range(width)
+        for y in range(height)
+    }
+
+
+class BitColumn:
+    __slots__ = ("grid", "x")
+
+    def __init__(self, grid: "BitGrid", x: int) -> None:
+        self.grid = grid
+        self.x = x
+
+    def __getitem__(self, y: int) -> bool:
+        return self.grid[self.x, y]
+
+    def __setitem__(self, y: int, item: bool) -> None:
+        self.grid[self.x, y] = item
+
+    def __len__(self) -> int:
+        return self.grid.height
+
+
+class BitGrid(Grid):
+    # Stores cells as bits of a Python int, cell (x, y) is bit x * height + y
+    def __init__(self, bits: int, width: int, height: int) -> None:
+        self.bits = bits
+        self.width = width
+        self.height = height
+        self.indices = get_cell_indices(width, height)
+
+    def __reduce__(self) -> tuple:
+        return type(self), (self.bits, self.width, self.height)
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "BitGrid":
+        data = np.ascontiguousarray(grid.data, dtype=bool).ravel()
+        packed = np.packbits(data, bitorder="little")
+        bits = int.from_bytes(packed.tobytes(), "little")
+        return cls(bits, grid.width, grid.height)
+
+    @property
+    def size(self) -> int:
+        return self.width * self.height
+
+    @property
+    def data(self) -> np.ndarray:
+        num_bytes = (self.size + 7) // 8
+        packed = np.frombuffer(
+            self.bits.to_bytes(num_bytes, "little"), dtype=np.uint8
+        )
+        data = np.unpackbits(packed, count=self.size, bitorder="little")
+        return data.astype(bool).reshape(self.width, self.height)
+
+    def get_index(self, position: Position) -> int:
+        try:
+            return self.indices[position]
+        except KeyError:
+            raise IndexError(f"Position {position} is out of bounds")
+
+    def __getitem__(self, idx: Union[int, Position]) -> Union[bool, BitColumn]:
+        if isinstance(idx, tuple):
+            try:
+                return self.bits >> self.indices[idx] & 1 == 1
+            except KeyError:
+                raise IndexError(f"Position {idx} is out of bounds")
+        if not 0 <= idx < self.width:
+            raise IndexError(f"Index {idx} is out of bounds")
+        return BitColumn(self, idx)
+
+    def __setitem__(self, key: Union[int, Position], item: bool) -> None:
+        if isinstance(key, tuple):
+            mask = 1 << self.get_index(key)
+        else:
+            mask = ((1 << self.height) - 1) << (key * self.height)
+        if item:
+            self.bits |= mask
+        else:
+            self.bits &= ~mask
+
+    def __contains__(self, position: Position) -> bool:
+        return self[position]
+
+    def __iter__(self) -> Iterator[BitColumn]:
+        for x in range(self.width):
+            yield BitColumn(self, x)
+
+    def __len__(self) -> int:
+        return self.width
+
+    def get_positions(self) -> list[Position]:
+        positions = []
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            x, y = divmod(lowest.bit_length() - 1, self.height)
+            positions.append(Position(x, y))
+            bits ^= lowest
+        return positions
+
+    def copy(self) -> "BitGrid":
+        return type(self)(self.bits, self.width, self.height)
+
+    def invert(self) -> "BitGrid":
+        full = (1 << self.size) - 1
+        return BitGrid(~self.bits & full, self.width, self.height)
+
+    def count(self, value: bool = True) -> int:
+        num_set = popcount(self.bits)
+        return num_set if value is True else self.size - num_set
+
+    @classmethod
+    def full(cls, width: int, height: int, value: bool = False) -> "BitGrid":
+        bits = (1 << width * height) - 1 if value else 0
+        return cls(bits, width, height)
+
+
+class BitWalls(BitGrid, Walls):
+    # Walls do not change during a game, so cell lookups are precomputed
+    def __init__(self, bits: int, width: int, height: int) -> None:
+        super().__init__(bits, width, height)
+        self.__update_cells()
+
+    def __update_cells(self) -> None:
+        cells = self.data.ravel().tolist()
+        self.cells = dict(zip(self.indices, cells))
+
+    def __getitem__(self, idx: Union[int, Position]) -> Union[bool, BitColumn]:
+        try:
+            return self.cells[idx]
+        except KeyError:
+            return super().__getitem__(idx)
+
+    def __setitem__(self, key: Union[int, Position], item: bool) -> None:
+        super().__setitem__(key, item)
+        self.__update_cells()
@@ -1,10 +1,16 @@
 import numpy as np
 import heapq
-from collections import deque
-from typing import Any, Optional, Union
-from dataclasses import dataclass
+from collections import OrderedDict, deque
+from itertools import count
+from typing import Any, Callable, Optional, Sequence, Union
+from dataclasses import dataclass, field
 
-from ..consts.types import PosToIdx, Position, Cost
+from ..consts.game import INF_COST
+from ..consts.types import CellIndex, Position, Cost
+
+MAX_CACHED_CELLS = 4096
+# Cell index of walls and positions off the maze
+NO_CELL = -1
 
 
 class Queue:
@@ -35,30 +41,218 @@ class Stack:
         return len(self.data) == 0
 
 
+class NodeArena:
+    # Search nodes are stored column-wise and referenced by index, a path is
+    # rebuilt from parent links only once the goal is reached
+    ROOT = -1
+
+    def __init__(self) -> None:
+        self.states = []
+        self.parents = []
+        self.actions = []
+        self.costs = []
+        self.closed = []
+
+    def add(self, state: Any, parent: int, action: Any, cost: Cost = 0) -> int:
+        self.states.append(state)
+        self.parents.append(parent)
+        self.actions.append(action)
+        self.costs.append(cost)
+        self.closed.append(False)
+        return len(self.states) - 1
+
+    def get_path(self, node: int) -> list[Any]:
+        path = []
+        while self.parents[node] != NodeArena.ROOT:
+            path.append(self.actions[node])
+            node = self.parents[node]
+        path.reverse()
+        return path
+
+    def clear(self) -> None:
+        self.states.clear()
+        self.parents.clear()
+        self.actions.clear()
+        self.costs.clear()
+        self.closed.clear()
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+
 class PriorityQueue:
+    # The counter breaks priority ties, so items are never compared
     def __init__(self) -> None:
         self.queue = []
+        self.counter = count()
 
     def push(self, item: Any, priority: Union[int, float]) -> None:
-        heapq.heappush(self.queue, (priority, item))
+        heapq.heappush(self.queue, (priority, next(self.counter), item))
 
     def pop(self) -> tuple[Any, Union[int, float]]:
-        priority, item = heapq.heappop(self.queue)
+        priority, _, item = heapq.heappop(self.queue)
         return item, priority
 
     def is_empty(self) -> bool:
         return len(self.queue) == 0
 
 
+class LRUCache:
+    # Keeps the most recently used values, built on the first lookup
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.values: OrderedDict = OrderedDict()
+
+    def get(self, key: Any, build: Callable[[], Any]) -> Any:
+        value = self.values.get(key)
+        if value is None:
+            value = self.values[key] = build()
+            if len(self.values) > self.max_size:
+                self.values.popitem(last=False)
+        else:
+            self.values.move_to_end(key)
+        return value
+
+    def clear(self) -> None:
+        self.values.clear()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class HeapFrontier:
+    # A key pushed again supersedes its queued entry, which is then skipped
+    # on pop instead of being searched for in the heap
+    def __init__(self, tie_break: bool = False) -> None:
+        self.tie_break = tie_break
+        self.heap = []
+        self.counter = count()
+        self.entries: dict[Any, int] = {}
+
+    def push(
+        self,
+        key: Any,
+        item: Any,
+        priority: Union[int, float],
+        tie: Union[int, float] = 0,
+    ) -> None:
+        entry = self.entries[key] = next(self.counter)
+        tie = tie if self.tie_break else 0
+        heapq.heappush(self.heap, (priority, tie, entry, key, item))
+
+    def pop(self) -> tuple[Any, Union[int, float]]:
+        while True:
+            priority, _, entry, key, item = heapq.heappop(self.heap)
+            if self.entries.get(key) == entry:
+                del self.entries[key]
+                return item, priority
+
+    def is_empty(self) -> bool:
+        return len(self.entries) == 0
+
+
+class BucketQueue:
+    # Integer priorities index a list of buckets, so push and pop are O(1)
+    # in the priority while it grows slowly, as f does in A* on unit-cost
+    # mazes. Each bucket is a small heap on (tie, entry), so nodes come out
+    # in the same order as from a HeapFrontier
+    def __init__(self, tie_break: bool = False) -> None:
+        self.tie_break = tie_break
+        self.buckets: list[list] = []
+        self.min_priority = 0
+        self.counter = count()
+        self.entries: dict[Any, int] = {}
+
+    def push(
+        self,
+        key: Any,
+        item: Any,
+        priority: int,
+        tie: Union[int, float] = 0,
+    ) -> None:
+        priority = int(priority)
+        while len(self.buckets) <= priority:
+            self.buckets.append([])
+        entry = self.entries[key] = next(self.counter)
+        tie = tie if self.tie_break else 0
+        heapq.heappush(self.buckets[priority], (tie, entry, key, item))
+        self.min_priority = min(self.min_priority, priority)
+
+    def pop(self) -> tuple[Any, int]:
+        while True:
+            bucket = self.buckets[self.min_priority]
+            if len(bucket) == 0:
+                self.min_priority += 1
+                continue
+            _, entry, key, item = heapq.heappop(bucket)
+            if self.entries.get(key) == entry:
+                del self.entries[key]
+                return item, self.min_priority
+
+    def is_empty(self) -> bool:
+        return len(self.entries) == 0
+
+
 @dataclass(eq=False)
 class MazeDistance:
     maze_dists: np.ndarray
-    mapping: PosToIdx
-    goal_mapping: Optional[dict[int, int]]
+    mapping: CellIndex
+    unreachable: Optional[int] = field(init=False)
+    cell_cache: LRUCache = field(
+        init=False, default_factory=lambda: LRUCache(MAX_CACHED_CELLS)
+    )
+    positions: Optional[list[Position]] = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        # Integer tables mark unreachable cells with the dtype maximum
+        dtype = self.maze_dists.dtype
+        if np.issubdtype(dtype, np.integer):
+            self.unreachable = np.iinfo(dtype).max
+        else:
+            self.unreachable = None
+
+    def get_cell(self, position: Position) -> int:
+        cell = self.mapping[position].item()
+        if cell == NO_CELL:
+            raise KeyError(position)
+        return cell
+
+    def get_position(self, cell: int) -> Position:
+        if self.positions is None:
+            xs, ys = (self.mapping >= 0).nonzero()
+            self.positions = [
+                Position(x, y) for x, y in zip(xs.tolist(), ys.tolist())
+            ]
+        return self.positions[cell]
+
+    def get_cells(self, positions: Sequence[Position]) -> np.ndarray:
+        # The same food and ghost layouts are looked up at many search nodes
+        key = tuple(positions)
+        return self.cell_cache.get(key, lambda: self.__build_cells(key))
+
+    def get_row(self, cell: int) -> np.ndarray:
+        if cell < 0:
+            raise KeyError(cell)
+        return self.maze_dists[cell]
+
+    def __build_cells(self, key: tuple[Position, ...]) -> np.ndarray:
+        xs = np.array([position[0] for position in key], dtype=np.intp)
+        ys = np.array([position[1] for position in key], dtype=np.intp)
+        cells = self.mapping[xs, ys]
+        if (cells < 0).any():
+            raise KeyError(key[(cells < 0).argmax()])
+        return cells
 
     def get(self, start: Position, end: Position) -> Cost:
-        end = self.mapping[end]
-        if self.goal_mapping is not None:
-            end = self.goal_mapping[end]
-        start = self.mapping[start]
-        return self.maze_dists[end, start]
+        dist = self.get_row(self.get_cell(start))[self.get_cell(end)].item()
+        return INF_COST if dist == self.unreachable else dist
+
+    def get_many(self, start: int, ends: np.ndarray) -> np.ndarray:
+        # Tables are symmetric, so the row of the start cell holds all ends.
+        # Ends come from get_cells, which rejects walls, so only the start
+        # is checked on this hot path
+        return self.get_row(start)[ends]
+
+    def min_to(self, start: int, targets: np.ndarray) -> Cost:
+        dist = self.get_many(start, targets).min().item()
+        return INF_COST if dist == self.unreachable else dist
@@ -1,47 +1,211 @@
+import os
+import tempfile
 import numpy as np
+from dataclasses import dataclass, field
+from pathlib import Path
 from scipy.sparse import csr_matrix
 from scipy.sparse.csgraph import shortest_path
 from typing import Optional
 
-from .data_structures import MazeDistance
-from ..consts.types import AdjList, AdjMatrix, PosToIdx, Position
+from .data_structures import NO_CELL, LRUCache, MazeDistance
+from .grid import Grid
+from ..consts.direction import TO_VECTOR, Direction
+from ..consts.types import Action, CellIndex
 
+# Larger mazes get distance rows on demand instead of an all-pairs table
+MAX_ALL_PAIRS_CELLS = 4096
+MAX_CACHED_ROWS = 512
 
-def adjlist_to_adjmatrix(adjlist: AdjList) -> tuple[AdjMatrix, PosToIdx]:
-    mapping = {position: idx for idx, position in enumerate(adjlist)}
-    num_nodes = len(mapping)
-    adjmatrix = get_empty_adjmatrix(num_nodes)
 
-    for parent, neighbors in adjlist.items():
-        p_idx = mapping[parent]
-        for neighbor, cost in neighbors:
-            n_idx = mapping[neighbor]
-            adjmatrix[p_idx, n_idx] = cost
+def get_cell_index(walls: Grid) -> CellIndex:
+    free = ~np.asarray(walls.data, dtype=bool)
+    cell_index = np.full(free.shape, NO_CELL, dtype=np.int32)
+    cell_index[free] = np.arange(np.count_nonzero(free), dtype=np.int32)
+    return cell_index
 
-    return adjmatrix, mapping
 
+def walls_to_csr(walls: Grid) -> tuple[csr_matrix, CellIndex]:
+    cell_index = get_cell_index(walls)
+    free = cell_index != NO_CELL
 
-def get_empty_adjmatrix(size: int) -> np.ndarray:
-    adjmatrix = np.full((size, size), float("inf"))
-    np.fill_diagonal(adjmatrix, 0)
-    return adjmatrix
+    rows, cols = [], []
+    # Connect every free cell with its free east and north neighbors
+    for dx, dy in [(1, 0), (0, 1)]:
+        width, height = free.shape
+        source = free[: width - dx, : height - dy]
+        target = free[dx:, dy:]
+        edges = source & target
+        rows.append(cell_index[: width - dx, : height - dy][edges])
+        cols.append(cell_index[dx:, dy:][edges])
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
 
+    num_nodes = np.count_nonzero(free)
+    data = np.ones(2 * len(rows), dtype=np.uint8)
+    csgraph = csr_matrix(
+        (data, (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(num_nodes, num_nodes),
+    )
+    return csgraph, cell_index
 
-def get_maze_dists(
-    adjmatrix: AdjMatrix,
-    mapping: PosToIdx,
-    goals: Optional[list[Position]] = None,
-) -> MazeDistance:
-    sparse_matrix = csr_matrix(adjmatrix)
-    if goals is not None:
-        goal_mapping = {mapping[goal]: idx for idx, goal in enumerate(goals)}
-        goal_idxs = list(goal_mapping.keys())
-    else:
-        goal_mapping = goal_idxs = None
-    maze_dists = shortest_path(
-        sparse_matrix,
-        directed=False,
-        return_predecessors=False,
-        indices=goal_idxs,
+
+@dataclass(eq=False)
+class NeighborTable:
+    # Moves out of every free cell in Direction.as_list() order, the order
+    # SearchProblem.get_neighbors generates them in
+    cell_index: CellIndex
+    free: list[list[bool]]
+    positions: list[tuple[int, int]]
+    moves: list[tuple[tuple[Action, int], ...]]
+
+    @classmethod
+    def build(cls, walls: Grid) -> "NeighborTable":
+        cell_index = get_cell_index(walls)
+        free = (cell_index != NO_CELL).tolist()
+        xs, ys = (cell_index != NO_CELL).nonzero()
+        positions = list(zip(xs.tolist(), ys.tolist()))
+        index = cell_index.tolist()
+        vectors = [
+            (action, TO_VECTOR[action]) for action in Direction.as_list()
+        ]
+        moves = [
+            tuple(
+                (action, index[x + dx][y + dy])
+                for action, (dx, dy) in vectors
+                if free[x + dx][y + dy]
+            )
+            for x, y in positions
+        ]
+        return cls(cell_index, free, positions, moves)
+
+    def get_cell(self, position: tuple[int, int]) -> int:
+        x, y = position
+        return self.cell_index[x, y].item()
+
+
+def get_dist_dtype(num_nodes: int) -> np.dtype:
+    # A path visits each cell at most once, so uint16 fits all small mazes
+    if num_nodes < np.iinfo(np.uint16).max:
+        return np.dtype(np.uint16)
+    return np.dtype(np.uint32)
+
+
+def bfs_maze_dists(
+    csgraph: csr_matrix, indices: Optional[list[int]] = None
+) -> np.ndarray:
+    dists = shortest_path(
+        csgraph, directed=False, unweighted=True, indices=indices
     )
-    return MazeDistance(maze_dists, mapping, goal_mapping)
+    dtype = get_dist_dtype(csgraph.shape[0])
+    dists[np.isinf(dists)] = np.iinfo(dtype).max
+    return dists.astype(dtype)
+
+
+@dataclass(eq=False)
+class LazyMazeDistance(MazeDistance):
+    # Computes the distance row of a cell on first use and keeps the most
+    # recently used rows
+    csgraph: csr_matrix = None
+    max_rows: int = MAX_CACHED_ROWS
+    rows: LRUCache = field(init=False)
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.rows = LRUCache(self.max_rows)
+
+    def get_row(self, cell: int) -> np.ndarray:
+        if cell < 0:
+            raise KeyError(cell)
+        return self.rows.get(
+            cell, lambda: bfs_maze_dists(self.csgraph, indices=cell)
+        )
+
+
+def get_tree_weight(dists: np.ndarray) -> float:
+    # Prim's algorithm on a dense symmetric matrix, inf marks missing edges
+    num_nodes = len(dists)
+    if num_nodes <= 1:
+        return 0.0
+    in_tree = np.zeros(num_nodes, dtype=bool)
+    in_tree[0] = True
+    nearest = dists[0].astype(float)
+    weight = 0.0
+    for _ in range(num_nodes - 1):
+        node = np.where(in_tree, np.inf, nearest).argmin()
+        weight += nearest[node]
+        in_tree[node] = True
+        np.minimum(nearest, dists[node], out=nearest)
+    return weight
+
+
+def get_path_costs(dists: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Held-Karp over a symmetric distance matrix: costs[mask, j] is the
+    # shortest walk through all points of the mask that ends (or, read
+    # backwards, starts) at point j, parents[mask, j] is the point before j
+    num_points = len(dists)
+    masks = np.arange(1 << num_points)
+    points = np.arange(num_points)
+    costs = np.full((len(masks), num_points), np.inf)
+    parents = np.full((len(masks), num_points), -1, dtype=np.int8)
+    costs[1 << points, points] = 0
+
+    sizes = np.zeros(len(masks), dtype=np.int8)
+    for point in points:
+        sizes += (masks >> point & 1).astype(np.int8)
+    for size in range(2, num_points + 1):
+        layer = masks[sizes == size]
+        for point in points:
+            ends = layer[layer >> point & 1 == 1]
+            candidates = costs[ends ^ 1 << point] + dists[:, point]
+            best = candidates.argmin(axis=1)
+            costs[ends, point] = candidates[np.arange(len(ends)), best]
+            parents[ends, point] = best
+    return costs, parents
+
+
+def get_all_maze_dists(
+    walls: Grid, cache_path: Optional[Path] = None
+) -> MazeDistance:
+    csgraph, cell_index = walls_to_csr(walls)
+    num_nodes = csgraph.shape[0]
+    if num_nodes > MAX_ALL_PAIRS_CELLS:
+        empty = np.empty((0, num_nodes), dtype=get_dist_dtype(num_nodes))
+        return LazyMazeDistance(empty, cell_index, csgraph)
+
+    maze_dists = None
+    if cache_path is not None:
+        maze_dists = load_maze_dists(cache_path, num_nodes)
+    if maze_dists is None:
+        maze_dists = bfs_maze_dists(csgraph)
+        if cache_path is not None:
+            save_maze_dists(cache_path, maze_dists)
+    return MazeDistance(maze_dists, cell_index)
+
+
+def load_maze_dists(cache_path: Path, num_nodes: int) -> Optional[np.ndarray]:
+    # A missing, truncated or foreign file is a cache miss
+    try:
+        maze_dists = np.load(cache_path, mmap_mode="r")
+    except (OSError, ValueError, EOFError):
+        return None
+    if maze_dists.shape != (num_nodes, num_nodes):
+        return None
+    if maze_dists.dtype != get_dist_dtype(num_nodes):
+        return None
+    return maze_dists
+
+
+def save_maze_dists(cache_path: Path, maze_dists: np.ndarray) -> None:
+    # Tournament workers share the cache directory, so the table is written
+    # to a temporary file and renamed: readers never see a partial file
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=cache_path.parent, suffix=".npy", delete=False
+    ) as file:
+        temp_path = Path(file.name)
+        try:
+            np.save(file, maze_dists)
+        except BaseException:
+            file.close()
+            temp_path.unlink()
+            raise
+    os.replace(temp_path, cache_path)
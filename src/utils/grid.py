@@ -1,11 +1,8 @@
 import numpy as np
-from collections import defaultdict
 from dataclasses import dataclass, field
 
-from .data_structures import Queue
-from .graph import adjlist_to_adjmatrix
 from ..consts.direction import TO_VECTOR, Direction
-from ..consts.types import AdjList, AdjMatrix, PosToIdx, Position
+from ..consts.types import Position
 
 
 @dataclass(eq=False)
@@ -25,7 +22,10 @@ class Grid:
 
     def get_positions(self) -> list[Position]:
         xs, ys = np.nonzero(self.data == True)
-        return [Position(x, y) for x, y in zip(xs, ys)]
+        return [Position(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+
+    def copy(self) -> "Grid":
+        return type(self)(self.data.copy())
 
     def invert(self) -> "Grid":
         return Grid(~self.data)
@@ -46,29 +46,6 @@ class Walls(Grid):
         for action, move in TO_VECTOR.items():
             if action != Direction.STOP:
                 next = (position + move).as_int()
-                if not self.data[next.x][next.y]:
+                if not self[next]:
                     neighbors.append(next)
         return neighbors
-
-    def get_adjlist(self) -> AdjList:
-        adjlist = defaultdict(list)
-        visited = set()
-
-        for start in self.invert().get_positions():
-            queue = Queue()
-            queue.push(start)
-
-            while not queue.is_empty():
-                parent = queue.pop()
-                if parent in visited:
-                    continue
-                visited.add(parent)
-
-                for neighbor in self.get_neighbors(parent):
-                    queue.push(neighbor)
-                    adjlist[parent].append((neighbor, 1))
-        return adjlist
-
-    def get_adjmatrix(self) -> tuple[AdjMatrix, PosToIdx]:
-        adjlist = self.get_adjlist()
-        return adjlist_to_adjmatrix(adjlist)
@@ -1,13 +1,78 @@
+import hashlib
 import numpy as np
 import random
 from pathlib import Path
 from typing import Any, Optional, Union
 from dataclasses import InitVar, dataclass, field
 
+from .bitboard import BitWalls
 from .grid import Grid, Walls
+from .graph import (
+    NO_CELL,
+    NeighborTable,
+    get_all_maze_dists,
+    get_cell_index,
+)
+from .data_structures import LRUCache, MazeDistance
 from .general import nearest_odd
 from ..consts.types import Position, TextMaze
-from ..consts.direction import MazeMove
+from ..consts.direction import TO_VECTOR, Direction, MazeMove
+from ..utils.vector import Point
+
+Actions = tuple[int, ...]
+
+
+@dataclass(eq=False)
+class ActionTable:
+    # Legal actions per cell id, as NeighborTable and MazeDistance index
+    # cells. The nested list maps positions to ids faster than numpy does
+    cell_index: list[list[int]]
+    pacman: list[Actions]
+    ghost: list[dict[int, Actions]]
+
+    @classmethod
+    def build(cls, walls: Grid) -> "ActionTable":
+        cell_index = get_cell_index(walls)
+        xs, ys = (cell_index != NO_CELL).nonzero()
+        pacman, ghost = [], []
+        for position in map(Point, xs.tolist(), ys.tolist()):
+            actions = tuple(
+                direction
+                for direction, vector in TO_VECTOR.items()
+                if not walls[position + vector]
+            )
+            pacman.append(actions)
+            ghost.append(
+                {
+                    direction: ActionTable.__get_ghost_actions(
+                        actions, direction
+                    )
+                    for direction in Direction.as_list(with_stop=True)
+                }
+            )
+        return cls(cell_index.tolist(), pacman, ghost)
+
+    def get_pacman_actions(self, position: Point) -> Actions:
+        return self.pacman[self.cell_index[position[0]][position[1]]]
+
+    def get_ghost_actions(self, position: Point, direction: int) -> Actions:
+        cell = self.cell_index[position[0]][position[1]]
+        return self.ghost[cell][direction]
+
+    @staticmethod
+    def __get_ghost_actions(actions: Actions, direction: int) -> Actions:
+        actions = [action for action in actions if action != Direction.STOP]
+        reverse = -direction
+        if reverse in actions and len(actions) > 1:
+            actions.remove(reverse)
+        return tuple(actions)
+
+
+# Runs that generate a maze per game would otherwise keep every table
+MAX_CACHED_LAYOUTS = 8
+ACTION_TABLES = LRUCache(MAX_CACHED_LAYOUTS)
+MAZE_DISTS = LRUCache(MAX_CACHED_LAYOUTS)
+NEIGHBOR_TABLES = LRUCache(MAX_CACHED_LAYOUTS)
 
 
 @dataclass(eq=False)
@@ -33,6 +98,41 @@ class Layout:
             if self.walls is not None
             else Walls.full(self.width, self.height)
         )
+        self._bit_walls = None
+        self._key = None
+
+    def get_key(self) -> str:
+        if self._key is None:
+            walls = np.ascontiguousarray(self.walls.data, dtype=bool)
+            digest = hashlib.sha1(walls.tobytes()).hexdigest()
+            self._key = f"{self.width}x{self.height}-{digest[:16]}"
+        return self._key
+
+    def get_bit_walls(self) -> BitWalls:
+        if self._bit_walls is None:
+            self._bit_walls = BitWalls.from_grid(self.walls)
+        return self._bit_walls
+
+    def get_action_table(self) -> ActionTable:
+        return ACTION_TABLES.get(
+            self.get_key(), lambda: ActionTable.build(self.get_bit_walls())
+        )
+
+    def get_neighbor_table(self) -> NeighborTable:
+        return NEIGHBOR_TABLES.get(
+            self.get_key(), lambda: NeighborTable.build(self.get_bit_walls())
+        )
+
+    def get_maze_dists(
+        self, cache_dir: Optional[Union[str, Path]] = None
+    ) -> MazeDistance:
+        key = self.get_key()
+        cache_path = (
+            Path(cache_dir) / f"{key}.npy" if cache_dir is not None else None
+        )
+        return MAZE_DISTS.get(
+            key, lambda: get_all_maze_dists(self.get_bit_walls(), cache_path)
+        )
 
     def save(self, path: str) -> None:
         pass
@@ -133,13 +233,14 @@ class MazeGenerator:
         active = [current]
         while active:
             if random.random() < backtrack_prob:
-                current = active[-1]
+                idx = len(active) - 1
             else:
-                current = random.choice(active)
+                idx = random.randrange(len(active))
+            current = active[idx]
 
             neighbors = MazeGenerator.__get_neighbors(current, walls)
             if not neighbors:
-                active.remove(current)
+                del active[idx]
                 continue
             next = random.choice(neighbors)
             active.append(next)
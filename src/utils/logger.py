@@ -13,6 +13,8 @@ class Logger:
     mode: str = "a"
 
     def __post_init__(self) -> None:
+        self.log_path = Path(self.log_path)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
         self.header = not self.log_path.exists()
 
     def log_result(self, result: GameResult) -> None:
@@ -23,4 +25,5 @@ class Logger:
             )
             if self.header:
                 writer.writeheader()
+                self.header = False
             writer.writerow(result)
@@ -60,4 +60,71 @@ def get_parser() -> ArgumentParser:
         help="number of consecutive games to play ",
         default=1,
     )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run games without graphics and report games per second",
+    )
+    return parser
+
+
+def get_tournament_parser() -> ArgumentParser:
+    parser = get_parser()
+    parser.description = "Pacman Tournament"
+
+    parser.add_argument(
+        "--agents",
+        type=str,
+        nargs="+",
+        default=["minimax"],
+        help="pacman agents to evaluate",
+    )
+    parser.add_argument(
+        "--layouts",
+        type=str,
+        nargs="+",
+        default=["random"],
+        help="layout names to play on; 'random' generates a new maze",
+    )
+    parser.add_argument(
+        "--ghost-counts",
+        type=int,
+        nargs="+",
+        default=[1],
+        help="numbers of ghosts to play against",
+    )
+    parser.add_argument(
+        "--ghost",
+        type=str,
+        default="greedy",
+        help="ghost agent type",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=1,
+        help="number of worker processes to play games on",
+    )
+    parser.add_argument(
+        "--maze-cache",
+        type=str,
+        help="directory to persist maze distance tables in",
+    )
+    parser.add_argument(
+        "--move-time",
+        type=float,
+        help="time budget of a search agent per move, in seconds",
+    )
+    parser.add_argument(
+        "--move-nodes",
+        type=int,
+        help="node (or simulation) budget of a search agent per move",
+    )
+    parser.add_argument(
+        "--search-workers",
+        type=int,
+        default=1,
+        help="number of processes a search agent splits its root over; "
+        "more than one only helps with a free core per process",
+    )
     return parser
@@ -1,13 +1,16 @@
 import math
 from dataclasses import dataclass
-from typing import Generator, Union
+from operator import itemgetter
+from typing import ClassVar, Iterator, Union
+
+new_tuple = tuple.__new__
 
 
 @dataclass(order=True, unsafe_hash=True)
 class Vector:
     x: float = 0.0
     y: float = None
-    threshold: float = 1e-6
+    threshold: ClassVar[float] = 1e-6
 
     def __post_init__(self) -> None:
         if self.y is None:
@@ -19,13 +22,16 @@ class Vector:
     def as_tuple(self) -> tuple[float, float]:
         return self.x, self.y
 
-    def as_int(self, up: bool = False) -> "Vector":
+    def as_int(self, up: bool = False) -> "Point":
         if up is True:
-            return Vector(
+            return Point(
                 int(self.x + 0.5),
                 int(self.y + 0.5),
             )
-        return Vector(int(self.x), int(self.y))
+        return Point(int(self.x), int(self.y))
+
+    def is_int(self) -> bool:
+        return float(self.x).is_integer() and float(self.y).is_integer()
 
     def manhattan(self, other: "Vector") -> float:
         dx, dy = abs(self - other)
@@ -39,7 +45,7 @@ class Vector:
         dx2, dy2 = (self - other) ** 2
         return dx2 + dy2
 
-    def nearest(self) -> "Vector":
+    def nearest(self) -> "Point":
         return self.as_int(up=True)
 
     def __add__(self, other: "Vector") -> "Vector":
@@ -60,7 +66,7 @@ class Vector:
             self.y * scalar,
         )
 
-    def __floordiv__(self, value: Union[int, float]) -> "Vector":
+    def __floordiv__(self, value: Union[int, float]) -> "Point":
         return (self / value).as_int()
 
     def __truediv__(self, value: Union[int, float]) -> "Vector":
@@ -89,6 +95,87 @@ class Vector:
                 return True
         return False
 
-    def __iter__(self) -> Generator[float, None, None]:
-        for coord in self.as_tuple():
-            yield coord
+    def __iter__(self) -> Iterator[float]:
+        return iter((self.x, self.y))
+
+
+class Point(tuple):
+    # Immutable grid-aligned position. Hashes and compares like (x, y),
+    # so it is interchangeable with an integral Vector as a dict key
+    __slots__ = ()
+
+    x = property(itemgetter(0))
+    y = property(itemgetter(1))
+
+    def __new__(cls, x: int, y: int) -> "Point":
+        return new_tuple(cls, (x, y))
+
+    def __getnewargs__(self) -> tuple[int, int]:
+        return self[0], self[1]
+
+    def __repr__(self) -> str:
+        return f"Point(x={self[0]}, y={self[1]})"
+
+    def magnitude(self) -> float:
+        return math.sqrt(self[0] ** 2 + self[1] ** 2)
+
+    def as_tuple(self) -> tuple[int, int]:
+        return self[0], self[1]
+
+    def as_int(self, up: bool = False) -> "Point":
+        return self
+
+    def is_int(self) -> bool:
+        return True
+
+    def manhattan(self, other: Union["Point", Vector]) -> float:
+        x, y = self
+        xx, yy = other
+        return abs(x - xx) + abs(y - yy)
+
+    def chebyshev(self, other: Union["Point", Vector]) -> float:
+        x, y = self
+        xx, yy = other
+        return min(abs(x - xx), abs(y - yy))
+
+    def euclidean(self, other: Union["Point", Vector]) -> float:
+        x, y = self
+        xx, yy = other
+        return (x - xx) ** 2 + (y - yy) ** 2
+
+    def nearest(self) -> "Point":
+        return self
+
+    def __add__(self, other: Union["Point", Vector]) -> Union["Point", Vector]:
+        x, y = self
+        dx, dy = other
+        if type(other) is Point:
+            return new_tuple(Point, (x + dx, y + dy))
+        return Vector(x + dx, y + dy)
+
+    def __sub__(self, other: Union["Point", Vector]) -> Union["Point", Vector]:
+        x, y = self
+        dx, dy = other
+        if type(other) is Point:
+            return new_tuple(Point, (x - dx, y - dy))
+        return Vector(x - dx, y - dy)
+
+    def __mul__(self, scalar: Union[int, float]) -> Union["Point", Vector]:
+        x, y = self
+        if float(scalar).is_integer():
+            scalar = int(scalar)
+            return new_tuple(Point, (x * scalar, y * scalar))
+        return Vector(x * scalar, y * scalar)
+
+    def __floordiv__(self, value: Union[int, float]) -> "Point":
+        return (self / value).as_int()
+
+    def __truediv__(self, value: Union[int, float]) -> Vector:
+        return Vector(self[0], self[1]) / value
+
+    def __pow__(self, value: float) -> Vector:
+        return Vector(self[0] ** value, self[1] ** value)
+
+    def __abs__(self) -> "Point":
+        x, y = self
+        return new_tuple(Point, (abs(x), abs(y)))
@@ -0,0 +1,18 @@
+import random
+import numpy as np
+import pytest
+
+from src.pacman.rules import GameState
+from src.utils.layout import Layout
+
+
+@pytest.fixture(autouse=True)
+def seed() -> None:
+    random.seed(0)
+    np.random.seed(0)
+
+
+def new_state(name: str, num_ghosts: int = 0) -> GameState:
+    state = GameState()
+    state.initialize(Layout.from_text(name), num_ghosts)
+    return state
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from pathlib import Path
+
+from src.pacman.rl import (
+    BatchEnv,
+    BatchTrainer,
+    DQNAgentConfig,
+    DQNConfig,
+    EpsParams,
+    ModelConfig,
+)
+from src.pacman.rl.agents import ACTION_MAP
+from src.pacman.rules import GameState
+from src.utils.layout import Layout
+
+
+def test_rewards_match_game_state() -> None:
+    # Without ghosts the game is deterministic, so every reward and the
+    # end of the game must match GameState move for move
+    layout = Layout.generate(height=11, width=11, num_food=5, num_ghosts=0)
+    env = BatchEnv(lambda: layout, num_envs=1, num_ghosts=0, seed=0)
+    env.reset()
+    rng = np.random.default_rng(0)
+
+    for _ in range(5):
+        state = GameState()
+        state.initialize(layout, 0)
+        terminal = False
+        while not terminal:
+            legal = np.flatnonzero(env.get_legal_moves()[0])
+            action = rng.choice(legal)
+            score = state.get_score()
+            state = state.generate_next(0, ACTION_MAP[action])
+            _, rewards, terminals = env.step(np.array([action]))
+            terminal = terminals[0]
+
+            assert rewards[0] == state.get_score() - score
+            assert terminal == (state.is_win() or state.is_lose())
+        assert env.finished[-1] == state.get_score()
+
+
+def new_layout() -> Layout:
+    return Layout.generate(height=11, width=11, num_food=5, num_ghosts=1)
+
+
+def new_config(model_path: Path, train_start: int) -> DQNAgentConfig:
+    return DQNAgentConfig(
+        model=ModelConfig(
+            dqn=DQNConfig(width=11, height=11, in_channels=4),
+            memory=1000,
+            lr=2e-4,
+            batch_size=8,
+            gamma=0.999,
+            update_step=200,
+            model_path=str(model_path),
+            train_start=train_start,
+            print_every=10 ** 9,
+            device="cpu",
+        ),
+        eps_params=EpsParams(start=0.9, end=0.1, step=100),
+        train=True,
+    )
+
+
+@pytest.mark.parametrize("transitions_per_update", [1, 3, 8])
+def test_trainer_updates_per_transition(
+    tmp_path: Path, transitions_per_update: int
+) -> None:
+    env = BatchEnv(new_layout, num_envs=8, num_ghosts=1, seed=0)
+    trainer = BatchTrainer(
+        new_config(tmp_path / "model.pth", train_start=8),
+        env,
+        transitions_per_update,
+    )
+    trainer.run(5)
+
+    # Training starts once the first step fills the replay memory
+    num_updates = -(-8 // transitions_per_update)
+    assert trainer.model.step == 5 * num_updates
+    # Exploration decays with transitions whatever the update ratio
+    assert trainer.num_transitions == 40
+    assert trainer.eps == pytest.approx(0.9 - 0.8 * 40 / 100)
@@ -0,0 +1,49 @@
+import pytest
+
+from .conftest import new_state
+from src.pacman.multiagent.agents import ExpectimaxAgent
+from src.pacman.multiagent.states import ReflexState
+from src.utils.data_structures import MazeDistance
+
+# Losing costs 500, and three moves on medium.lay cannot score 100
+BOUNDS = (-600, 100)
+
+
+def utility(state: ReflexState, maze_dists: MazeDistance) -> float:
+    # Noise free, so pruned and full searches must agree exactly
+    game_state = state.game_state
+    pacman = maze_dists.get_cell(game_state.get_pacman_position())
+    ghosts = maze_dists.get_cells(
+        [ghost.nearest() for ghost in game_state.get_ghost_positions()]
+    )
+    return game_state.get_score() + maze_dists.min_to(pacman, ghosts)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(utility_bounds=BOUNDS),
+        dict(table_size=2 ** 12),
+        dict(table_size=2 ** 12, utility_bounds=BOUNDS),
+    ],
+)
+def test_pruning_and_cache_keep_values(kwargs: dict) -> None:
+    state = new_state("medium", num_ghosts=2)
+    plain = ExpectimaxAgent(depth=3, utility=utility)
+    agent = ExpectimaxAgent(depth=3, utility=utility, **kwargs)
+    for reflex_agent in [plain, agent]:
+        reflex_agent.register_state(state)
+
+    for _ in range(3):
+        root = ReflexState(state)
+        expected = plain._search_root(root, plain.depth)
+        value = agent._search_root(root, agent.depth)
+        assert value.cost == pytest.approx(expected.cost)
+        state = state.generate_next(0, expected.action)
+        for ghost in range(1, state.get_num_agents()):
+            if state.is_win() or state.is_lose():
+                return
+            state = state.generate_next(
+                ghost, state.get_legal_actions(ghost)[0]
+            )
+    assert agent.nodes <= plain.nodes
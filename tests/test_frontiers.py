@@ -0,0 +1,60 @@
+import random
+import pytest
+
+from .conftest import new_state
+from src.pacman.search.cost_fns import FoodCostFn
+from src.pacman.search.heuristics import distance_heuristic
+from src.pacman.search.problems import PositionProblem
+from src.pacman.search.solvers import a_star
+from src.utils.data_structures import BucketQueue, HeapFrontier
+from src.utils.vector import Point
+
+
+def drain(frontier) -> list:
+    items = []
+    while not frontier.is_empty():
+        items.append(frontier.pop())
+    return items
+
+
+@pytest.mark.parametrize("tie_break", [False, True])
+def test_frontiers_pop_in_same_order(tie_break: bool) -> None:
+    rng = random.Random(0)
+    heap, buckets = HeapFrontier(tie_break), BucketQueue(tie_break)
+    for item in range(500):
+        # Repeated keys supersede their earlier entries
+        key = rng.randrange(200)
+        priority, tie = rng.randrange(30), rng.randrange(5)
+        for frontier in [heap, buckets]:
+            frontier.push(key, item, priority, tie)
+    assert drain(heap) == drain(buckets)
+
+
+@pytest.mark.parametrize("tie_break", [False, True])
+def test_a_star_paths_match_across_frontiers(tie_break: bool) -> None:
+    state = new_state("medium")
+    goal = Point(1, 1)
+    paths = [
+        a_star(
+            PositionProblem(state, goal),
+            heuristic=distance_heuristic,
+            frontier_type=frontier_type,
+            tie_break=tie_break,
+        )
+        for frontier_type in [HeapFrontier, BucketQueue]
+    ]
+    assert paths[0] == paths[1]
+    assert len(paths[0]) > 0
+
+
+def test_bucket_queue_rejects_fractional_costs() -> None:
+    problem = PositionProblem(
+        new_state("medium"), Point(1, 1), cost_fn=FoodCostFn, empty_cost=1.5
+    )
+    with pytest.raises(ValueError, match="HeapFrontier"):
+        a_star(
+            problem,
+            heuristic=distance_heuristic,
+            frontier_type=BucketQueue,
+        )
+    assert len(a_star(problem, heuristic=distance_heuristic)) > 0
@@ -0,0 +1,89 @@
+import random
+import pytest
+from pathlib import Path
+
+from .conftest import new_state
+from src.pacman.search.problems import PositionProblem
+from src.pacman.search.solvers import bfs, bidirectional_bfs, jump_point_search
+from src.pacman.rules import GameState
+from src.utils import layout as layouts
+from src.utils.layout import Layout
+from src.utils.vector import Point
+
+SOLVERS = [bidirectional_bfs, jump_point_search]
+
+
+def open_room(tmp_path: Path, seed: int) -> GameState:
+    # Open areas with scattered walls, where jump points prune the most
+    rng = random.Random(seed)
+    width, height = 21, 13
+    rows = []
+    for y in range(height):
+        row = [
+            "#"
+            if x in (0, width - 1)
+            or y in (0, height - 1)
+            or rng.random() < 0.2
+            else " "
+            for x in range(width)
+        ]
+        rows.append("".join(row))
+    rows[1] = "#P" + rows[1][2:]
+    (tmp_path / f"room{seed}.lay").write_text("\n".join(rows) + "\n")
+    state = GameState()
+    state.initialize(Layout.from_text(f"room{seed}", str(tmp_path)), 0)
+    return state
+
+
+def replay(problem: PositionProblem, actions: list[int]) -> bool:
+    state = problem.get_start()
+    for action in actions:
+        moves = [
+            neighbor
+            for neighbor, move, _ in problem.get_neighbors(state)
+            if move == action
+        ]
+        if not moves:
+            return False
+        state = moves[0]
+    return problem.is_goal(state)
+
+
+def check_pairs(state: GameState, num_pairs: int, seed: int) -> None:
+    rng = random.Random(seed)
+    positions = state.get_layout().get_neighbor_table().positions
+    for _ in range(num_pairs):
+        start, goal = rng.choice(positions), rng.choice(positions)
+        problem = PositionProblem(state, Point(*goal), Point(*start))
+        expected = bfs(problem)
+        if not expected and start != goal:
+            continue
+        for solver in SOLVERS:
+            actions = solver(problem)
+            assert len(actions) == len(expected), solver.__name__
+            assert replay(problem, actions), solver.__name__
+
+
+@pytest.mark.parametrize("name", ["small", "medium", "big", "corners"])
+def test_paths_are_shortest_on_layouts(name: str) -> None:
+    check_pairs(new_state(name), 60, seed=0)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_paths_are_shortest_in_open_rooms(tmp_path: Path, seed: int) -> None:
+    check_pairs(open_room(tmp_path, seed), 150, seed)
+
+
+def test_unreachable_goal_gives_no_path(tmp_path: Path) -> None:
+    (tmp_path / "split.lay").write_text("#######\n#P #  #\n#######\n")
+    state = GameState()
+    state.initialize(Layout.from_text("split", str(tmp_path)), 0)
+    problem = PositionProblem(state, Point(4, 1))
+    for solver in SOLVERS:
+        assert solver(problem) == []
+
+
+def test_neighbor_tables_cache_is_bounded() -> None:
+    for _ in range(layouts.MAX_CACHED_LAYOUTS + 3):
+        Layout.generate(height=11, width=11, num_food=1).get_neighbor_table()
+    assert len(layouts.NEIGHBOR_TABLES) <= layouts.MAX_CACHED_LAYOUTS
@@ -0,0 +1,34 @@
+from src.pacman.search.heuristics import mst_food_heuristic
+from src.pacman.search.problems import AllFoodProblem
+from src.pacman.search.solvers import a_star, ucs
+from src.pacman.rules import GameState
+from src.utils.layout import Layout
+
+
+def get_states(problem: AllFoodProblem, actions: list[int]) -> list:
+    states = [problem.get_start()]
+    for action in actions:
+        states.append(
+            next(
+                neighbor
+                for neighbor, move, _ in problem.get_neighbors(states[-1])
+                if move == action
+            )
+        )
+    return states
+
+
+def test_mst_heuristic_is_admissible() -> None:
+    for num_food in range(1, 7):
+        state = GameState()
+        layout = Layout.generate(
+            height=11, width=11, num_food=num_food, num_ghosts=0
+        )
+        state.initialize(layout, 0)
+        problem = AllFoodProblem(state)
+        actions = ucs(problem)
+        # Every state on an optimal path has its optimal cost to go left
+        for idx, path_state in enumerate(get_states(problem, actions)):
+            cost_to_go = len(actions) - idx
+            assert mst_food_heuristic(path_state, problem) <= cost_to_go
+        assert len(a_star(problem, mst_food_heuristic)) == len(actions)
@@ -0,0 +1,62 @@
+import heapq
+import random
+
+import pytest
+
+from .conftest import new_state
+from src.consts.game import INF_COST
+from src.pacman.search.incremental import DStarLite
+from src.utils.graph import NO_CELL, walls_to_csr
+
+
+def dijkstra(neighbors: list[list[int]], costs: list, goals: set) -> list:
+    # Backwards from the goals, stepping into a cell costs its cost
+    dists = [INF_COST] * len(neighbors)
+    queue = []
+    for goal in goals:
+        dists[goal] = 0
+        queue.append((0, goal))
+    heapq.heapify(queue)
+    while queue:
+        dist, cell = heapq.heappop(queue)
+        if dist > dists[cell]:
+            continue
+        for neighbor in neighbors[cell]:
+            next_dist = dist + costs[cell]
+            if next_dist < dists[neighbor]:
+                dists[neighbor] = next_dist
+                heapq.heappush(queue, (next_dist, neighbor))
+    return dists
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_updates_match_full_search(seed: int) -> None:
+    rng = random.Random(seed)
+    state = new_state("medium")
+    csgraph, cell_index = walls_to_csr(state.get_walls())
+    indptr, indices = csgraph.indptr.tolist(), csgraph.indices.tolist()
+    neighbors = [
+        indices[indptr[cell] : indptr[cell + 1]]
+        for cell in range(len(indptr) - 1)
+    ]
+    xs, ys = (cell_index != NO_CELL).nonzero()
+    positions = list(zip(xs.tolist(), ys.tolist()))
+    costs = [1] * len(neighbors)
+    goals = set(rng.sample(range(len(neighbors)), 10))
+    start = rng.randrange(len(neighbors))
+    planner = DStarLite(neighbors, positions, costs, goals, start)
+
+    for _ in range(50):
+        assert planner.compute()
+        expected = dijkstra(neighbors, costs, goals)
+        assert planner.get_cost(start) == expected[start]
+
+        start = rng.choice(neighbors[start])
+        planner.move_start(start)
+        for cell in rng.sample(range(len(neighbors)), 5):
+            costs[cell] = rng.choice([1, 2, 5, 50])
+            planner.set_cost(cell, costs[cell])
+        if len(goals) > 1 and rng.random() < 0.3:
+            goal = rng.choice(sorted(goals))
+            goals.remove(goal)
+            planner.remove_goal(goal)
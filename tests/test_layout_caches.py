@@ -0,0 +1,46 @@
+from src.consts.direction import TO_VECTOR, Direction
+from src.utils import layout as layouts
+from src.utils.data_structures import LRUCache
+from src.utils.layout import Layout
+
+
+def test_lru_cache_drops_least_recently_used() -> None:
+    cache = LRUCache(2)
+    built = []
+
+    def build(key: str):
+        return lambda: built.append(key) or key
+
+    for key in ["a", "b", "a", "c", "a", "b"]:
+        assert cache.get(key, build(key)) == key
+    # "b" was evicted by "c" and had to be built again
+    assert built == ["a", "b", "c", "b"]
+    assert len(cache) == 2
+
+
+def test_maze_dists_cache_is_bounded() -> None:
+    for _ in range(layouts.MAX_CACHED_LAYOUTS + 3):
+        layout = Layout.generate(height=11, width=11, num_food=1)
+        layout.get_maze_dists()
+    assert len(layouts.MAZE_DISTS) <= layouts.MAX_CACHED_LAYOUTS
+
+
+def test_action_table_matches_walls() -> None:
+    layout = Layout.from_text("medium")
+    table = layout.get_action_table()
+    walls = layout.walls
+    for position in walls.invert().get_positions():
+        actions = table.get_pacman_actions(position)
+        expected = [
+            direction
+            for direction, vector in TO_VECTOR.items()
+            if not walls[position + vector]
+        ]
+        assert list(actions) == expected
+        for direction in Direction.as_list():
+            ghost = table.get_ghost_actions(position, direction)
+            assert Direction.STOP not in ghost
+            assert set(ghost) <= set(actions)
+            # Ghosts only turn back in dead ends
+            assert -direction not in ghost or len(ghost) == 1
+    assert len(layouts.ACTION_TABLES) <= layouts.MAX_CACHED_LAYOUTS
@@ -0,0 +1,27 @@
+import numpy as np
+from pathlib import Path
+
+from src.utils.graph import get_all_maze_dists
+from src.utils.layout import Layout
+
+
+def test_cached_table_round_trips(tmp_path: Path) -> None:
+    walls = Layout.from_text("medium").get_bit_walls()
+    cache_path = tmp_path / "medium.npy"
+    fresh = get_all_maze_dists(walls, cache_path)
+    cached = get_all_maze_dists(walls, cache_path)
+    assert np.array_equal(fresh.maze_dists, cached.maze_dists)
+    # Nothing but the table is left in the cache directory
+    assert list(tmp_path.iterdir()) == [cache_path]
+
+
+def test_truncated_table_is_a_cache_miss(tmp_path: Path) -> None:
+    walls = Layout.from_text("medium").get_bit_walls()
+    cache_path = tmp_path / "medium.npy"
+    expected = get_all_maze_dists(walls, cache_path).maze_dists.copy()
+    cache_path.write_bytes(cache_path.read_bytes()[:100])
+
+    maze_dists = get_all_maze_dists(walls, cache_path)
+    assert np.array_equal(maze_dists.maze_dists, expected)
+    # The broken file was replaced with a complete one
+    assert np.array_equal(np.load(cache_path), expected)
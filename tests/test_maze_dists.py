@@ -0,0 +1,25 @@
+import pytest
+
+from src.utils import graph
+from src.utils.graph import get_all_maze_dists
+from src.utils.layout import Layout
+from src.utils.vector import Point
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_wall_lookups_raise(monkeypatch, lazy: bool) -> None:
+    if lazy:
+        monkeypatch.setattr(graph, "MAX_ALL_PAIRS_CELLS", 0)
+    walls = Layout.from_text("small").get_bit_walls()
+    maze_dists = get_all_maze_dists(walls)
+    assert isinstance(maze_dists, graph.LazyMazeDistance) is lazy
+
+    assert maze_dists.get(Point(1, 1), Point(2, 1)) == 1
+    with pytest.raises(KeyError):
+        maze_dists.get(Point(0, 0), Point(1, 1))
+    with pytest.raises(KeyError):
+        maze_dists.get_cell(Point(0, 0))
+    with pytest.raises(KeyError):
+        maze_dists.get_cells([Point(1, 1), Point(0, 3)])
+    with pytest.raises(KeyError):
+        maze_dists.min_to(graph.NO_CELL, maze_dists.get_cells([Point(1, 1)]))
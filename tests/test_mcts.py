@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from src.consts.direction import Direction
+from src.pacman.multiagent.mcts import MCTSAgent
+from src.pacman.rules import GameState
+from src.utils.layout import Layout
+
+CORRIDOR = """\
+##################
+#.         P     #
+##################
+##################
+"""
+
+
+def corridor_state(tmp_path: Path) -> GameState:
+    (tmp_path / "corridor.lay").write_text(CORRIDOR)
+    state = GameState()
+    state.initialize(Layout.from_text("corridor", str(tmp_path)), 0)
+    return state
+
+
+def test_leaves_are_valued_by_utility(tmp_path: Path) -> None:
+    # The only pellet is ten moves away, so until a simulation reaches it
+    # only the utility tells the two directions apart
+    state = corridor_state(tmp_path)
+    agent = MCTSAgent(num_simulations=50)
+    agent.register_state(state)
+    assert agent.get_action(state) == Direction.WEST
+
+
+def test_reused_tree_keeps_statistics(tmp_path: Path) -> None:
+    state = corridor_state(tmp_path)
+    agent = MCTSAgent(num_simulations=50)
+    agent.register_state(state)
+    action = agent.get_action(state)
+    child = agent.root.children[action]
+    visits = child.visits
+
+    agent.get_action(state.generate_next(0, action))
+    assert agent.root is child
+    assert child.visits == visits + 50
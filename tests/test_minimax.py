@@ -0,0 +1,33 @@
+import pytest
+
+from .conftest import new_state
+from .test_expectimax import utility
+from src.pacman.multiagent.agents import MinimaxAgent
+from src.pacman.multiagent.states import ReflexState
+
+
+@pytest.mark.parametrize("table_size", [2 ** 6, 2 ** 10, 2 ** 14])
+def test_table_keeps_values(table_size: int) -> None:
+    state = new_state("medium", num_ghosts=2)
+    plain = MinimaxAgent(depth=5, utility=utility)
+    agent = MinimaxAgent(depth=5, utility=utility, table_size=table_size)
+    for reflex_agent in [plain, agent]:
+        reflex_agent.register_state(state)
+
+    for _ in range(4):
+        root = ReflexState(state)
+        expected = plain._search_root(root, plain.depth)
+        value = agent._search_root(root, agent.depth)
+        assert value.cost == pytest.approx(expected.cost)
+        state = state.generate_next(0, expected.action)
+        for ghost in range(1, state.get_num_agents()):
+            if state.is_win() or state.is_lose():
+                break
+            state = state.generate_next(
+                ghost, state.get_legal_actions(ghost)[0]
+            )
+        if state.is_win() or state.is_lose():
+            break
+    probes, hits = agent._get_table_counts()
+    assert hits > 0
+    assert agent.nodes <= plain.nodes
@@ -0,0 +1,53 @@
+import pytest
+
+from .conftest import new_state
+from .test_expectimax import utility
+from src.pacman.multiagent.agents import ExpectimaxAgent, MinimaxAgent
+from src.pacman.multiagent.states import ReflexState
+
+
+def test_pool_is_kept_per_layout() -> None:
+    state = new_state("small", num_ghosts=1)
+    agent = MinimaxAgent(depth=2, num_workers=2)
+    agent.register_state(state)
+    agent.get_action(state)
+    executor = agent.pool.executor
+    assert executor is not None
+
+    # The next game on the same layout reuses the workers
+    agent.register_state(new_state("small", num_ghosts=1))
+    assert agent.pool.executor is executor
+    # A new layout restarts them
+    agent.register_state(new_state("medium", num_ghosts=2))
+    assert agent.pool.executor is not executor
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+    agent.pool.close()
+    assert agent.pool.executor is None
+
+
+@pytest.mark.parametrize("agent_type", [MinimaxAgent, ExpectimaxAgent])
+def test_root_split_keeps_values(agent_type: type) -> None:
+    state = new_state("medium", num_ghosts=2)
+    serial = agent_type(depth=2, utility=utility)
+    agent = agent_type(depth=2, utility=utility, num_workers=2)
+    for reflex_agent in [serial, agent]:
+        reflex_agent.register_state(state)
+
+    for _ in range(8):
+        root = ReflexState(state)
+        expected = serial._search_root(root, serial.depth)
+        value = agent._search_root(root, agent.depth)
+        assert value.cost == pytest.approx(expected.cost)
+        assert value.action == expected.action
+        state = state.generate_next(0, expected.action)
+        for ghost in range(1, state.get_num_agents()):
+            if state.is_win() or state.is_lose():
+                break
+            state = state.generate_next(
+                ghost, state.get_legal_actions(ghost)[0]
+            )
+        if state.is_win() or state.is_lose():
+            break
+    agent.pool.close()
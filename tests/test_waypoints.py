@@ -0,0 +1,61 @@
+from itertools import permutations
+
+import pytest
+
+from .conftest import new_state
+from src.pacman.search.problems import MAX_WAYPOINTS, WaypointProblem
+from src.pacman.search.solvers import held_karp
+from src.pacman.rules import GameState
+from src.utils.layout import Layout
+
+
+def brute_force_cost(problem: WaypointProblem) -> int:
+    maze_dists = problem.get_maze_dists()
+    start = maze_dists.get_cell(problem.get_start().position)
+    cells = maze_dists.get_cells(problem.get_points()).tolist()
+    best = None
+    for order in permutations(cells):
+        cost, cell = 0, start
+        for next_cell in order:
+            cost += maze_dists.get_row(cell)[next_cell].item()
+            cell = next_cell
+        best = cost if best is None else min(best, cost)
+    return best
+
+
+def visits_all(problem: WaypointProblem, actions: list[int]) -> bool:
+    state = problem.get_start()
+    for action in actions:
+        state = next(
+            neighbor
+            for neighbor, move, _ in problem.get_neighbors(state)
+            if move == action
+        )
+    return problem.is_goal(state)
+
+
+def test_held_karp_matches_brute_force() -> None:
+    for num_points in range(1, 7):
+        state = GameState()
+        layout = Layout.generate(
+            height=15, width=15, num_food=num_points, num_ghosts=0
+        )
+        state.initialize(layout, 0)
+        problem = WaypointProblem(state)
+        actions = held_karp(problem)
+        assert len(actions) == brute_force_cost(problem)
+        assert visits_all(problem, actions)
+
+
+def test_held_karp_on_fixed_layout() -> None:
+    state = new_state("medium")
+    problem = WaypointProblem(state, state.get_food_sources()[::16])
+    actions = held_karp(problem)
+    assert len(actions) == brute_force_cost(problem)
+    assert visits_all(problem, actions)
+
+
+def test_too_many_waypoints_are_rejected() -> None:
+    state = new_state("medium")
+    with pytest.raises(ValueError, match=f"{MAX_WAYPOINTS} points, got 97"):
+        WaypointProblem(state)
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from src.pacman.tournament import get_matches, run_tournament
+from src.utils.parser import get_tournament_parser
+
+
+if __name__ == "__main__":
+    options = get_tournament_parser().parse_args()
+
+    matches = get_matches(
+        agents=options.agents,
+        layouts=options.layouts,
+        ghost_counts=options.ghost_counts,
+        num_games=options.num_games,
+        seed=options.seed,
+        ghost=options.ghost,
+        width=options.width,
+        height=options.height,
+        num_food=options.num_food,
+        maze_cache=options.maze_cache,
+        move_time=options.move_time,
+        move_nodes=options.move_nodes,
+        search_workers=options.search_workers,
+    )
+    run_tournament(matches, Path(options.log_path), options.num_workers)